@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import OpClass
 
 
 class User(AbstractUser):
@@ -16,6 +18,9 @@ class User(AbstractUser):
         indexes = [
             models.Index(fields=['email', 'is_verified']),
             models.Index(fields=['role', 'is_active']),
+            # Case-insensitive prefix search (istartswith) for the assignee directory
+            models.Index(OpClass(Upper('username'), name='text_pattern_ops'), name='user_username_prefix_idx'),
+            models.Index(OpClass(Upper('email'), name='text_pattern_ops'), name='user_email_prefix_idx'),
         ]
 
     def is_admin(self):
@@ -1,13 +1,38 @@
 import csv
-from django.http import HttpResponse
+import io
+from django.http import StreamingHttpResponse
 from rest_framework import permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
+from notifications.outbox import outbox_metrics
 from payments.models import PaymentTransaction
 
 User = get_user_model()
 
+# CSV rows written per streamed chunk
+CSV_CHUNK_ROWS = 500
+
+
+def iter_csv(header, rows):
+    """Yield CSV text in chunks of CSV_CHUNK_ROWS rows so large exports are never held in memory"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def csv_response(filename, header, rows):
+    response = StreamingHttpResponse(iter_csv(header, rows), content_type='text/csv')
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
 
 class AdminUsersView(APIView):
     permission_classes = [permissions.IsAdminUser]
@@ -29,23 +54,23 @@ class ExportUsersCSVView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response["Content-Disposition"] = 'attachment; filename="users.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['id', 'username', 'email', 'role', 'is_verified', 'is_disabled'])
-        for u in User.objects.all():
-            writer.writerow([u.id, u.username, u.email, u.role, u.is_verified, u.is_disabled])
-        return response
+        columns = ['id', 'username', 'email', 'role', 'is_verified', 'is_disabled']
+        rows = User.objects.order_by('id').values_list(*columns).iterator(chunk_size=2000)
+        return csv_response('users.csv', columns, rows)
 
 
 class ExportPaymentsCSVView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response["Content-Disposition"] = 'attachment; filename="payments.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['id', 'user_id', 'amount', 'currency', 'status', 'created_at'])
-        for p in PaymentTransaction.objects.all():
-            writer.writerow([p.id, p.user_id, p.amount, p.currency, p.status, p.created_at])
-        return response
+        columns = ['id', 'user_id', 'amount', 'currency', 'status', 'created_at']
+        rows = PaymentTransaction.objects.values_list(*columns).iterator(chunk_size=2000)
+        return csv_response('payments.csv', columns, rows)
+
+
+class PushOutboxMetricsView(APIView):
+    """Push outbox queue depth and lag, for monitoring"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(outbox_metrics())
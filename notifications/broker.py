@@ -0,0 +1,156 @@
+"""
+Fan-out of live events to the open notification streams of each user.
+
+``InProcessBroker`` delivers to streams served by the same process, which is
+enough for a single ASGI process handling both the writes and the streams.
+With ``NOTIFICATION_BROKER_URL`` set (``redis://...``), ``RedisBroker`` publishes
+through Redis pub/sub so events written by any web or Celery process reach
+streams held by every other process.
+
+Publishing is thread-safe and never raises: a failed publish only costs live
+delivery, and clients catch up from the inbox.
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    import redis.asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Frames buffered per stream before the client is told to resync
+SUBSCRIPTION_QUEUE_SIZE = 100
+REDIS_CHANNEL_PREFIX = 'notifications:user:'
+
+
+class Subscription:
+    """One open stream; created inside the event loop that serves it"""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(SUBSCRIPTION_QUEUE_SIZE)
+        self.overflowed = False
+
+    def push(self, frame):
+        """Queue ``frame`` from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, frame)
+        except RuntimeError:
+            # The serving loop has shut down
+            pass
+
+    def _put(self, frame):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def clear(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.overflowed = False
+
+
+class InProcessBroker:
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id, frame):
+        self.deliver(user_id, frame)
+
+    def deliver(self, user_id, frame):
+        """Hand ``frame`` to the streams of ``user_id`` open in this process"""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.push(frame)
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Publishes through Redis; one pattern subscription per event loop feeds the
+    local streams.
+    """
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self._client = None
+        self._listeners = {}
+
+    def publish(self, user_id, frame):
+        try:
+            if self._client is None:
+                self._client = redis.Redis.from_url(self.url)
+            self._client.publish(f'{REDIS_CHANNEL_PREFIX}{user_id}', frame)
+        except redis.RedisError as e:
+            logger.error(f"Failed to publish live event for user {user_id}: {str(e)}")
+
+    def subscribe(self, user_id):
+        subscription = super().subscribe(user_id)
+        listener = self._listeners.get(subscription.loop)
+        if listener is None or listener.done():
+            self._listeners[subscription.loop] = subscription.loop.create_task(self._listen())
+        return subscription
+
+    async def _listen(self):
+        while True:
+            try:
+                client = redis.asyncio.Redis.from_url(self.url)
+                pubsub = client.pubsub()
+                await pubsub.psubscribe(f'{REDIS_CHANNEL_PREFIX}*')
+                async for message in pubsub.listen():
+                    if message['type'] != 'pmessage':
+                        continue
+                    user_id = int(message['channel'].decode().rsplit(':', 1)[1])
+                    self.deliver(user_id, message['data'].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Live event listener lost its Redis connection: {str(e)}")
+                await asyncio.sleep(1)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            url = getattr(settings, 'NOTIFICATION_BROKER_URL', '')
+            if url and REDIS_AVAILABLE:
+                _broker = RedisBroker(url)
+            else:
+                if url:
+                    logger.warning("redis is not installed; live events are delivered in-process only")
+                _broker = InProcessBroker()
+        return _broker
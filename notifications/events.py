@@ -0,0 +1,47 @@
+"""
+Live events for the notification stream (server-sent events).
+
+Events are encoded once as SSE frames and handed to the broker after the
+surrounding transaction commits, so clients never see rolled-back rows.
+"""
+from django.db import transaction
+
+from task_mangement_api.renderers import FastJSONRenderer
+from .broker import get_broker
+
+NOTIFICATION_EVENT = 'notification'
+RESYNC_EVENT = 'resync'
+
+
+def format_event(event, data, event_id=None):
+    """Encode one server-sent event frame"""
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines.append(f'event: {event}')
+    lines.append(f'data: {FastJSONRenderer().render(data).decode()}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def format_notification(notification):
+    from .serializers import NotificationSerializer
+
+    # The notification id doubles as the SSE id, so reconnecting clients resume after it
+    return format_event(NOTIFICATION_EVENT, NotificationSerializer(notification).data, notification.id)
+
+
+def publish_frames(frames):
+    """Hand ``(user ID, frame)`` pairs to the broker"""
+    broker = get_broker()
+    for user_id, frame in frames:
+        broker.publish(user_id, frame)
+
+
+def publish_frames_on_commit(frames):
+    frames = list(frames)
+    if frames:
+        transaction.on_commit(lambda: publish_frames(frames))
+
+
+def publish_notifications_on_commit(notifications):
+    publish_frames_on_commit(
+        (notification.user_id, format_notification(notification)) for notification in notifications
+    )
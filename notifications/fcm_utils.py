@@ -1,11 +1,10 @@
 """Firebase Cloud Messaging (FCM) utilities for push notifications"""
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
-from django.contrib.auth import get_user_model
 
 logger = logging.getLogger(__name__)
-User = get_user_model()
 
 # Firebase Admin SDK imports (optional, will be imported if available)
 try:
@@ -16,6 +15,11 @@ except ImportError:
     FIREBASE_AVAILABLE = False
     logger.warning("firebase-admin not installed. Push notifications will not work.")
 
+# FCM accepts at most 500 tokens per multicast call
+FCM_BATCH_SIZE = 500
+# Errors meaning a token is permanently invalid (app uninstalled, other sender)
+DEAD_TOKEN_ERRORS = ('UnregisteredError', 'SenderIdMismatchError')
+
 
 # Initialize Firebase (singleton pattern)
 _firebase_initialized = False
@@ -51,155 +55,189 @@ def initialize_firebase():
         return False
 
 
-def send_push_notification(user, title, body, data=None):
-    """
-    Send push notification to a specific user
-
-    Args:
-        user: User instance or user ID
-        title: Notification title
-        body: Notification body
-        data: Optional dictionary of additional data
-
-    Returns:
-        bool: True if notification sent successfully
-    """
+def get_messaging_backend():
+    """firebase_admin.messaging once Firebase is initialized, else None"""
     if not FIREBASE_AVAILABLE:
         logger.warning("Firebase not available. Skipping push notification.")
-        return False
-
+        return None
     if not initialize_firebase():
-        return False
+        return None
+    return messaging
 
-    from .models import DeviceToken
 
-    # Get user instance if ID provided
-    if isinstance(user, int):
-        try:
-            user = User.objects.get(id=user)
-        except User.DoesNotExist:
-            logger.error(f"User with ID {user} not found")
-            return False
+class PushResult:
+    """Outcome of a push to one device token"""
 
-    # Get all device tokens for the user
-    tokens = DeviceToken.objects.filter(user=user).values_list('token', flat=True)
+    def __init__(self, token, user_id, message_id=None, error=None, dead=False):
+        self.token = token
+        self.user_id = user_id
+        self.message_id = message_id
+        self.error = error
+        # The token is permanently invalid and has been removed
+        self.dead = dead
 
-    if not tokens:
-        logger.warning(f"No device tokens found for user {user.username}")
-        return False
+    @property
+    def success(self):
+        return self.error is None
 
-    # Prepare notification message
-    notification = messaging.Notification(
-        title=title,
-        body=body
-    )
+    def __repr__(self):
+        status = 'sent' if self.success else f'failed: {self.error}'
+        return f"<PushResult user={self.user_id} token={self.token[:12]}... {status}>"
 
-    # Prepare data payload
-    if data is None:
-        data = {}
-    data['click_action'] = 'FLUTTER_NOTIFICATION_CLICK'
 
-    success_count = 0
-    invalid_tokens = []
+class PushReport:
+    """Per-token results of one send"""
 
-    # Send to each device token
-    for token in tokens:
-        try:
-            message = messaging.Message(
-                notification=notification,
-                data=data,
-                token=token,
-            )
+    def __init__(self, results=()):
+        self.results = list(results)
 
-            response = messaging.send(message)
-            logger.info(f"Push notification sent successfully: {response}")
-            success_count += 1
+    @property
+    def success_count(self):
+        return sum(1 for result in self.results if result.success)
 
-        except messaging.UnregisteredError:
-            logger.warning(f"Invalid token, removing: {token}")
-            invalid_tokens.append(token)
+    @property
+    def failure_count(self):
+        return len(self.results) - self.success_count
 
-        except Exception as e:
-            logger.error(f"Failed to send push notification to token {token}: {str(e)}")
+    @property
+    def dead_tokens(self):
+        return [result.token for result in self.results if result.dead]
 
-    # Remove invalid tokens
-    if invalid_tokens:
-        DeviceToken.objects.filter(token__in=invalid_tokens).delete()
-        logger.info(f"Removed {len(invalid_tokens)} invalid device tokens")
 
-    return success_count > 0
+def is_dead_token_error(exception):
+    """True for FCM errors meaning the token will never work again"""
+    # Matched by name so fake backends need not import firebase_admin
+    return type(exception).__name__ in DEAD_TOKEN_ERRORS
 
 
-def send_push_notification_multicast(user_ids, title, body, data=None):
+def _send_chunk(backend, chunk, notification, data):
+    """Send one batch of at most FCM_BATCH_SIZE (token, user ID) pairs"""
+    tokens = [token for token, _ in chunk]
+    try:
+        response = backend.send_each_for_multicast(
+            backend.MulticastMessage(notification=notification, data=data, tokens=tokens)
+        )
+    except Exception as e:
+        logger.error(f"Failed to send push batch of {len(tokens)} tokens: {str(e)}")
+        return [PushResult(token, user_id, error=str(e)) for token, user_id in chunk]
+
+    results = []
+    for (token, user_id), resp in zip(chunk, response.responses):
+        if resp.success:
+            results.append(PushResult(token, user_id, message_id=resp.message_id))
+        else:
+            results.append(PushResult(
+                token, user_id, error=str(resp.exception), dead=is_dead_token_error(resp.exception)
+            ))
+    return results
+
+
+def send_to_tokens(tokens, title, body, data=None, backend=None):
     """
-    Send push notification to multiple users
+    Send one push notification to many devices
+
+    Tokens are sent in batches of FCM_BATCH_SIZE through send_each_for_multicast,
+    with up to FCM_MAX_WORKERS batches in flight. Dead tokens are deleted with one
+    query once every batch has finished.
 
     Args:
-        user_ids: List of user IDs
+        tokens: Iterable of (token, user ID) pairs
         title: Notification title
         body: Notification body
-        data: Optional dictionary of additional data
+        data: Optional dictionary of additional data (string values)
+        backend: Messaging module to send through; defaults to firebase_admin.messaging
 
     Returns:
-        int: Number of successful sends
+        PushReport: One PushResult per token
     """
-    if not FIREBASE_AVAILABLE:
-        logger.warning("Firebase not available. Skipping push notifications.")
-        return 0
+    from .models import DeviceToken
 
-    if not initialize_firebase():
-        return 0
+    if backend is None:
+        backend = get_messaging_backend()
+        if backend is None:
+            return PushReport()
+
+    tokens = list(tokens)
+    if not tokens:
+        return PushReport()
+
+    notification = backend.Notification(title=title, body=body)
+    # Copy so the caller's dictionary is not modified
+    data = {**(data or {}), 'click_action': 'FLUTTER_NOTIFICATION_CLICK'}
+
+    chunks = [tokens[i:i + FCM_BATCH_SIZE] for i in range(0, len(tokens), FCM_BATCH_SIZE)]
+    if len(chunks) == 1:
+        results = _send_chunk(backend, chunks[0], notification, data)
+    else:
+        max_workers = min(getattr(settings, 'FCM_MAX_WORKERS', 4), len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            batches = executor.map(lambda chunk: _send_chunk(backend, chunk, notification, data), chunks)
+            results = [result for batch in batches for result in batch]
+    report = PushReport(results)
+
+    dead_tokens = report.dead_tokens
+    if dead_tokens:
+        DeviceToken.objects.filter(token__in=dead_tokens).delete()
+        logger.info(f"Removed {len(dead_tokens)} invalid device tokens")
+
+    logger.info(f"Push notification sent. Success: {report.success_count}, Failure: {report.failure_count}")
+    return report
 
+
+def send_to_users(user_ids, title, body, data=None, backend=None):
+    """
+    Send one push notification to every device of ``user_ids``
+
+    Returns:
+        PushReport: One PushResult per device token
+    """
     from .models import DeviceToken
 
-    # Get all device tokens for the users
-    tokens = list(DeviceToken.objects.filter(user_id__in=user_ids).values_list('token', flat=True))
+    tokens = DeviceToken.objects.filter(user_id__in=user_ids).values_list('token', 'user_id')
+    return send_to_tokens(tokens, title, body, data, backend=backend)
 
-    if not tokens:
-        logger.warning(f"No device tokens found for {len(user_ids)} users")
-        return 0
 
-    # Prepare notification
-    notification = messaging.Notification(
-        title=title,
-        body=body
-    )
+def send_push_notification(user, title, body, data=None):
+    """
+    Queue a push notification to a specific user
 
-    # Prepare data payload
-    if data is None:
-        data = {}
-    data['click_action'] = 'FLUTTER_NOTIFICATION_CLICK'
+    The push is written to the outbox in the caller's transaction and delivered
+    by drain_push_outbox once it commits.
 
-    try:
-        # Send multicast message
-        message = messaging.MulticastMessage(
-            notification=notification,
-            data=data,
-            tokens=tokens,
-        )
+    Args:
+        user: User instance or user ID
+        title: Notification title
+        body: Notification body
+        data: Optional dictionary of additional data
 
-        response = messaging.send_multicast(message)
-        logger.info(f"Multicast notification sent. Success: {response.success_count}, Failure: {response.failure_count}")
+    Returns:
+        bool: True if notification queued successfully
+    """
+    user_id = user if isinstance(user, int) else user.id
+    return send_push_notification_multicast([user_id], title, body, data) > 0
 
-        # Handle failed tokens
-        if response.failure_count > 0:
-            failed_tokens = []
-            for idx, resp in enumerate(response.responses):
-                if not resp.success:
-                    failed_tokens.append(tokens[idx])
-                    logger.error(f"Failed to send to token: {resp.exception}")
 
-            # Remove invalid tokens
-            if failed_tokens:
-                DeviceToken.objects.filter(token__in=failed_tokens).delete()
-                logger.info(f"Removed {len(failed_tokens)} invalid device tokens")
+def send_push_notification_multicast(user_ids, title, body, data=None):
+    """
+    Queue a push notification to multiple users
 
-        return response.success_count
+    Args:
+        user_ids: List of user IDs
+        title: Notification title
+        body: Notification body
+        data: Optional dictionary of additional data
 
-    except Exception as e:
-        logger.error(f"Failed to send multicast notification: {str(e)}")
+    Returns:
+        int: Number of users the notification is pending for (see enqueue_push)
+    """
+    if not FIREBASE_AVAILABLE:
+        logger.warning("Firebase not available. Skipping push notification.")
         return 0
 
+    from .outbox import enqueue_push
+
+    return enqueue_push(user_ids, title, body, data)
+
 
 def send_task_assignment_notification(task, assigned_to_user):
     """
@@ -210,7 +248,7 @@ def send_task_assignment_notification(task, assigned_to_user):
         assigned_to_user: User instance who was assigned the task
 
     Returns:
-        bool: True if notification sent successfully
+        bool: True if notification queued successfully
     """
     title = "New Task Assigned"
     body = f"You've been assigned to task: {task.title}"
@@ -223,6 +261,28 @@ def send_task_assignment_notification(task, assigned_to_user):
     return send_push_notification(assigned_to_user, title, body, data)
 
 
+def send_task_assignment_notification_multicast(task, user_ids):
+    """
+    Send one multicast notification when a task is assigned to several users
+
+    Args:
+        task: Task instance
+        user_ids: List of IDs of the newly assigned users
+
+    Returns:
+        int: Number of users the notification was queued for
+    """
+    title = "New Task Assigned"
+    body = f"You've been assigned to task: {task.title}"
+    data = {
+        'type': 'task_assignment',
+        'task_id': str(task.id),
+        'task_title': task.title,
+    }
+
+    return send_push_notification_multicast(user_ids, title, body, data)
+
+
 def send_task_update_notification(task, users):
     """
     Send notification when a task is updated
@@ -232,7 +292,7 @@ def send_task_update_notification(task, users):
         users: List of User instances to notify
 
     Returns:
-        int: Number of successful sends
+        int: Number of users the notification was queued for
     """
     title = "Task Updated"
     body = f"Task '{task.title}' has been updated"
@@ -257,7 +317,7 @@ def send_payment_success_notification(user, amount, currency='USD'):
         currency: Currency code
 
     Returns:
-        bool: True if notification sent successfully
+        bool: True if notification queued successfully
     """
     title = "Payment Successful"
     body = f"Your payment of {currency} {amount} was processed successfully. Welcome to Pro!"
@@ -279,7 +339,7 @@ def send_account_status_notification(user, is_disabled):
         is_disabled: Boolean indicating if account is disabled
 
     Returns:
-        bool: True if notification sent successfully
+        bool: True if notification queued successfully
     """
     if is_disabled:
         title = "Account Disabled"
@@ -304,7 +364,7 @@ def send_registration_notification(user):
         user: User instance
 
     Returns:
-        bool: True if notification sent successfully
+        bool: True if notification queued successfully
     """
     title = "Welcome to Task Manager!"
     body = f"Hi {user.username}! Please verify your email to unlock all features."
@@ -324,7 +384,7 @@ def send_email_verification_success_notification(user):
         user: User instance
 
     Returns:
-        bool: True if notification sent successfully
+        bool: True if notification queued successfully
     """
     title = "Email Verified!"
     body = "Your email has been verified successfully. You now have full access to all features."
@@ -344,7 +404,7 @@ def send_password_reset_requested_notification(user):
         user: User instance
 
     Returns:
-        bool: True if notification sent successfully
+        bool: True if notification queued successfully
     """
     title = "Password Reset Requested"
     body = "We received a request to reset your password. Check your email for instructions."
@@ -364,7 +424,7 @@ def send_password_reset_success_notification(user):
         user: User instance
 
     Returns:
-        bool: True if notification sent successfully
+        bool: True if notification queued successfully
     """
     title = "Password Reset Successful"
     body = "Your password has been changed successfully. You can now log in with your new password."
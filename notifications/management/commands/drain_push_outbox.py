@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import OUTBOX_BATCH_SIZE, drain_outbox, outbox_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver due push notifications from the outbox in batches. '
+        'Safe to run alongside other drainers: rows are claimed with SKIP LOCKED.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE, help='Rows claimed per batch')
+        parser.add_argument('--forever', action='store_true', help='Keep polling instead of exiting when drained')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between polls with --forever')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        totals = {'claimed': 0, 'sent': 0, 'retried': 0, 'failed': 0}
+        while True:
+            stats = drain_outbox(batch_size)
+            for name, count in stats.items():
+                totals[name] += count
+            if options['verbosity'] > 1 and stats['claimed']:
+                self.stdout.write(f"  batch: {stats}")
+            if stats['claimed'] < batch_size:
+                if not options['forever']:
+                    break
+                time.sleep(options['interval'])
+
+        metrics = outbox_metrics()
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {totals['sent']} pushes, {totals['retried']} to retry, {totals['failed']} failed; "
+            f"{metrics['pending']} pending, lag {metrics['lag_seconds']:.0f}s"
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from notifications.models import Notification, NotificationCounter
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-user unread notification counters from the notifications table'
+
+    def handle(self, *args, **options):
+        unread = Notification.objects.filter(read_status=False)
+        counts = unread.order_by().values('user').annotate(unread_count=Count('id'))
+        counters = [NotificationCounter(user_id=row['user'], unread_count=row['unread_count']) for row in counts]
+
+        with transaction.atomic():
+            NotificationCounter.objects.bulk_create(
+                counters,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['unread_count'],
+            )
+            # Users with no unread notifications left
+            reset = NotificationCounter.objects.exclude(
+                user__in=unread.values('user')
+            ).exclude(unread_count=0).update(unread_count=0)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {len(counters)} notification counters ({reset} reset to zero)"
+        ))
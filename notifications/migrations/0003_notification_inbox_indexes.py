@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_alter_devicetoken_options_alter_notification_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notificatio_user_id_e67095_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notificatio_user_id_05b4bc_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'read_status', '-created_at', '-id'], name='notificatio_user_id_5bc04d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notificatio_user_id_90f3d6_idx'),
+        ),
+    ]
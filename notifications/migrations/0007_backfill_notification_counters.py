@@ -0,0 +1,22 @@
+from django.db import migrations
+
+# Create or correct the counter of every user with unread notifications. From
+# here on NotificationCounter.adjust() upserts the row, so it is never created
+# from a COUNT(*) that could miss a notification inserted by a concurrent,
+# uncommitted transaction.
+BACKFILL_SQL = """
+INSERT INTO notifications_notificationcounter (user_id, unread_count)
+SELECT user_id, COUNT(*) FROM notifications_notification WHERE NOT read_status GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET unread_count = EXCLUDED.unread_count;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_pushoutbox'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
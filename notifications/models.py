@@ -1,5 +1,38 @@
+from collections import Counter
+
 from django.conf import settings
-from django.db import models
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from .events import publish_notifications_on_commit
+
+
+class NotificationQuerySet(models.QuerySet):
+    """
+    Keeps NotificationCounter in step with inserts and pushes new rows to open
+    notification streams once the transaction commits.
+
+    ``create()`` and ``bulk_create()`` count new unread notifications; code that
+    flips ``read_status`` or deletes rows must adjust the counter itself.
+    """
+
+    def create(self, **kwargs):
+        with transaction.atomic(using=self.db):
+            notification = super().create(**kwargs)
+            if not notification.read_status:
+                NotificationCounter.adjust(notification.user_id, 1)
+            publish_notifications_on_commit([notification])
+        return notification
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            unread = Counter(obj.user_id for obj in objs if not obj.read_status)
+            for user_id, count in unread.items():
+                NotificationCounter.adjust(user_id, count)
+            # Rows skipped by ignore_conflicts come back without a primary key
+            publish_notifications_on_commit([obj for obj in objs if obj.pk is not None])
+        return objs
 
 
 class Notification(models.Model):
@@ -8,17 +41,79 @@ class Notification(models.Model):
     read_status = models.BooleanField(default=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', 'read_status']),
-            models.Index(fields=['user', '-created_at']),
+            # Inbox pages in cursor order, all or unread only
+            models.Index(fields=['user', 'read_status', '-created_at', '-id']),
+            models.Index(fields=['user', '-created_at', '-id']),
         ]
 
     def __str__(self):
         return f"Notification for {self.user.username} - {self.message[:50]}"
 
 
+class NotificationArchive(models.Model):
+    """Read notifications moved out of the live table by ``prune_notifications --archive``"""
+    # The original Notification id, so archiving a row twice is a no-op
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    message = models.TextField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived notification {self.id} for user {self.user_id}"
+
+
+class NotificationCounter(models.Model):
+    """
+    Per-user count of unread notifications, so the app badge is a primary key lookup
+
+    Rows were backfilled by migration 0007 and are upserted by ``adjust``, so a
+    user without a row has no unread notifications.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter'
+    )
+    unread_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread_count} unread"
+
+    @classmethod
+    def lock_for_user(cls, user):
+        """
+        Return the user's counter row locked with SELECT ... FOR UPDATE.
+
+        Must be called inside a transaction. A missing row is created at zero.
+        """
+        cls.objects.bulk_create([cls(user=user)], ignore_conflicts=True)
+        return cls.objects.select_for_update().get(user=user)
+
+    @classmethod
+    def get_count(cls, user):
+        return cls.objects.filter(user=user).values_list('unread_count', flat=True).first() or 0
+
+    @classmethod
+    def adjust(cls, user_id, delta):
+        """
+        Atomically add ``delta`` to the counter, creating the row if the user has none
+
+        A single upsert, so a notification created while another transaction creates
+        the row waits for that row instead of updating nothing.
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (user_id, unread_count) VALUES (%s, GREATEST(%s, 0)) "
+                f"ON CONFLICT (user_id) DO UPDATE SET unread_count = GREATEST({table}.unread_count + %s, 0)",
+                [user_id, delta, delta],
+            )
+
+
 class DeviceToken(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='device_tokens', db_index=True)
     token = models.CharField(max_length=255, unique=True, db_index=True)
@@ -29,3 +124,44 @@ class DeviceToken(models.Model):
 
     def __str__(self):
         return f"Device token for {self.user.username}"
+
+
+class PushOutbox(models.Model):
+    """
+    Push notification waiting to be delivered by ``drain_push_outbox``.
+
+    Rows are written in the same transaction as the change they announce, so a
+    push is never lost to an FCM outage or sent for a rolled-back change.
+    Delivered rows are deleted; rows that keep failing end up ``failed``.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        FAILED = 'failed', 'Failed'
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    title = models.CharField(max_length=255)
+    body = models.TextField()
+    data = models.JSONField(default=dict)
+    # Hash of title, body and data; identical pending pushes to a user collapse into one
+    dedupe_key = models.CharField(max_length=40)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # Claimed by a drainer until next_attempt_at; a crashed drainer's rows come back after it
+    leased = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Drain order
+            models.Index(fields=['status', 'next_attempt_at', 'id']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'dedupe_key'], condition=models.Q(status='pending'), name='push_outbox_pending_dedupe'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Push to user {self.user_id}: {self.title} ({self.status})"
@@ -0,0 +1,207 @@
+"""
+Transactional outbox for push notifications.
+
+``enqueue_push`` writes PushOutbox rows in the caller's transaction;
+``drain_outbox`` claims due rows in batches, delivers them through FCM and
+retries failures with exponential backoff and jitter.
+
+Without a Celery broker, jobs run in-process, so nothing drains the outbox on
+commit: run ``manage.py drain_push_outbox --forever`` alongside the web server.
+"""
+import hashlib
+import json
+import logging
+import random
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .models import DeviceToken, PushOutbox
+from .tasks import CELERY_AVAILABLE, drain_push_outbox, enqueue_on_commit
+
+logger = logging.getLogger(__name__)
+
+# Rows claimed per drain transaction
+OUTBOX_BATCH_SIZE = 500
+# Claimed rows are hidden from other workers this long; a crashed worker's rows come back after it
+OUTBOX_LEASE = timedelta(minutes=5)
+# Deliveries tried before a row is marked failed
+OUTBOX_MAX_ATTEMPTS = 8
+# Retry delay in seconds: doubles per attempt from the base, up to the cap
+OUTBOX_BACKOFF_BASE = 30
+OUTBOX_BACKOFF_MAX = 3600
+
+
+def dedupe_key(title, body, data):
+    payload = json.dumps([title, body, data], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def enqueue_push(user_ids, title, body, data=None):
+    """
+    Queue one push notification for each of ``user_ids``
+
+    A push identical to one still pending for the same user is dropped.
+    With a Celery worker, delivery starts once the current transaction commits;
+    otherwise the rows wait for the ``drain_push_outbox`` command.
+
+    Returns:
+        int: Number of users the push is pending for, counting users whose
+        copy collapsed into an identical pending one
+    """
+    data = dict(data or {})
+    key = dedupe_key(title, body, data)
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return 0
+
+    # The partial unique constraint on (user, dedupe_key) collapses duplicates
+    PushOutbox.objects.bulk_create(
+        [PushOutbox(user_id=user_id, title=title, body=body, data=data, dedupe_key=key) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+    # An eager drain would deliver the whole outbox inside the caller's request
+    if CELERY_AVAILABLE and not getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
+        enqueue_on_commit(drain_push_outbox)
+    return len(user_ids)
+
+
+def backoff_delay(attempts):
+    """Seconds to wait after failed attempt number ``attempts``: exponential with jitter"""
+    ceiling = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1))
+    # Jitter spreads out retries of rows that failed together
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def deliver(rows, backend):
+    """
+    Send claimed rows; identical pushes go out as one multicast
+
+    Returns:
+        dict: ID of each row to retry -> error
+    """
+    from .fcm_utils import send_to_tokens
+
+    tokens = defaultdict(list)
+    for token, user_id in DeviceToken.objects.filter(user_id__in={row.user_id for row in rows}).values_list(
+        'token', 'user_id'
+    ):
+        tokens[user_id].append(token)
+
+    groups = defaultdict(list)
+    for row in rows:
+        groups[row.dedupe_key].append(row)
+
+    errors = {}
+    for group in groups.values():
+        push = group[0]
+        report = send_to_tokens(
+            [(token, row.user_id) for row in group for token in tokens[row.user_id]],
+            push.title, push.body, push.data, backend=backend,
+        )
+        delivered = set()
+        failures = {}
+        for result in report.results:
+            if result.success:
+                delivered.add(result.user_id)
+            elif not result.dead:
+                # Dead tokens have been removed; a retry would not reach them either
+                failures.setdefault(result.user_id, result.error)
+        # A push that reached any of the user's devices is done: retrying it would
+        # repeat it on those devices
+        for row in group:
+            if row.user_id in failures and row.user_id not in delivered:
+                errors[row.id] = failures[row.user_id]
+    return errors
+
+
+def drain_outbox(batch_size=OUTBOX_BATCH_SIZE, backend=None):
+    """
+    Deliver one batch of due pushes
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased, so
+    several workers can drain concurrently without sending a row twice.
+
+    Args:
+        batch_size: Maximum number of rows to claim
+        backend: Messaging module to send through; defaults to firebase_admin.messaging
+
+    Returns:
+        dict: Counts of claimed, sent, retried and failed rows
+    """
+    from .fcm_utils import get_messaging_backend
+
+    now = timezone.now()
+    stats = {'claimed': 0, 'sent': 0, 'retried': 0, 'failed': 0}
+    with transaction.atomic():
+        rows = list(
+            PushOutbox.objects.filter(status=PushOutbox.Status.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id').select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not rows:
+            return stats
+        PushOutbox.objects.filter(id__in=[row.id for row in rows]).update(
+            attempts=F('attempts') + 1, next_attempt_at=now + OUTBOX_LEASE, leased=True
+        )
+    stats['claimed'] = len(rows)
+
+    if backend is None:
+        backend = get_messaging_backend()
+    if backend is None:
+        errors = {row.id: "FCM is not configured" for row in rows}
+    else:
+        errors = deliver(rows, backend)
+
+    retry = []
+    for row in rows:
+        if row.id not in errors:
+            continue
+        row.attempts += 1
+        row.leased = False
+        row.last_error = errors[row.id]
+        if row.attempts >= OUTBOX_MAX_ATTEMPTS:
+            row.status = PushOutbox.Status.FAILED
+            logger.error(f"Giving up on push {row.id} to user {row.user_id} after {row.attempts} attempts: {row.last_error}")
+            stats['failed'] += 1
+        else:
+            row.next_attempt_at = timezone.now() + timedelta(seconds=backoff_delay(row.attempts))
+            stats['retried'] += 1
+        retry.append(row)
+
+    with transaction.atomic():
+        stats['sent'] = PushOutbox.objects.filter(id__in=[row.id for row in rows if row.id not in errors]).delete()[0]
+        PushOutbox.objects.bulk_update(retry, ['status', 'next_attempt_at', 'leased', 'last_error'])
+    return stats
+
+
+def outbox_metrics():
+    """
+    Queue depth and lag of the push outbox
+
+    ``sending`` counts rows a drainer is delivering right now and ``retrying``
+    rows that failed before and are waiting for another attempt. ``lag_seconds``
+    is how long the oldest due row has been waiting for a worker; it grows when
+    draining falls behind.
+    """
+    now = timezone.now()
+    pending = Q(status=PushOutbox.Status.PENDING)
+    due = pending & Q(next_attempt_at__lte=now)
+    sending = pending & Q(leased=True, next_attempt_at__gt=now)
+    stats = PushOutbox.objects.aggregate(
+        pending=Count('id', filter=pending),
+        due=Count('id', filter=due),
+        sending=Count('id', filter=sending),
+        retrying=Count('id', filter=pending & Q(attempts__gt=0) & ~sending),
+        failed=Count('id', filter=Q(status=PushOutbox.Status.FAILED)),
+        oldest_created_at=Min('created_at', filter=pending),
+        oldest_due_at=Min('next_attempt_at', filter=due),
+    )
+    oldest_created_at = stats.pop('oldest_created_at')
+    oldest_due_at = stats.pop('oldest_due_at')
+    stats['oldest_pending_age_seconds'] = (now - oldest_created_at).total_seconds() if oldest_created_at else 0
+    stats['lag_seconds'] = (now - oldest_due_at).total_seconds() if oldest_due_at else 0
+    return stats
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from .models import Notification, DeviceToken
 
+# Maximum number of ids accepted by the bulk endpoints
+BULK_MAX_IDS = 500
+
 
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
@@ -13,3 +16,19 @@ class DeviceTokenSerializer(serializers.ModelSerializer):
     class Meta:
         model = DeviceToken
         fields = ('token',)
+
+
+class NotificationSelectionSerializer(serializers.Serializer):
+    """
+    Selects the notifications for a bulk action; exactly one of:
+    ``ids``, ``up_to_id`` (that notification and everything older in inbox order) or ``all``.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=BULK_MAX_IDS, required=False)
+    up_to_id = serializers.IntegerField(required=False)
+    all = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        selectors = [name for name in ('ids', 'up_to_id') if name in attrs] + (['all'] if attrs['all'] else [])
+        if len(selectors) != 1:
+            raise serializers.ValidationError("Provide exactly one of 'ids', 'up_to_id' or 'all'.")
+        return attrs
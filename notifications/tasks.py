@@ -0,0 +1,119 @@
+"""Background jobs for notification side effects (in-app notifications and push delivery)"""
+import logging
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+# Celery is optional; without it jobs run in-process when enqueued
+try:
+    from celery import shared_task
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            func.delay = func
+            return func
+        return decorator
+
+
+def enqueue_on_commit(job, *args):
+    """
+    Queue a background job once the current transaction commits
+
+    Args:
+        job: Celery task (or in-process fallback)
+        *args: Job arguments (must be serializable: pass IDs, not instances)
+    """
+    def enqueue():
+        try:
+            job.delay(*args)
+        except Exception as e:
+            # Never fail the request because the broker is unavailable
+            logger.error(f"Failed to enqueue {job.__name__}: {str(e)}")
+
+    transaction.on_commit(enqueue)
+
+
+@shared_task(ignore_result=True)
+def notify_task_assigned(task_id, user_id):
+    """
+    Create the in-app notification for a new task assignment
+
+    The push is written to the outbox by the view, in the assignment's transaction.
+    """
+    from tasks.models import Task
+    from .models import Notification
+
+    try:
+        task = Task.objects.get(pk=task_id)
+        assignee = User.objects.get(pk=user_id)
+    except (Task.DoesNotExist, User.DoesNotExist):
+        logger.warning(f"Skipping assignment notification for task {task_id}, user {user_id}: not found")
+        return
+
+    Notification.objects.create(
+        user=assignee,
+        message=f"You've been assigned to task: {task.title}"
+    )
+
+
+@shared_task(ignore_result=True)
+def notify_task_assigned_bulk(task_id, user_ids):
+    """
+    Create in-app notifications in bulk for new assignees
+
+    The multicast push is written to the outbox by the view, in the assignments' transaction.
+    """
+    from tasks.models import Task
+    from .models import Notification
+
+    try:
+        task = Task.objects.get(pk=task_id)
+    except Task.DoesNotExist:
+        logger.warning(f"Skipping assignment notifications for task {task_id}: not found")
+        return
+
+    Notification.objects.bulk_create([
+        Notification(user_id=user_id, message=f"You've been assigned to task: {task.title}")
+        for user_id in user_ids
+    ])
+
+
+@shared_task(ignore_result=True)
+def notify_task_unassigned(task_id, user_id):
+    """Create the in-app notification for a revoked task assignment"""
+    from tasks.models import Task
+    from .models import Notification
+
+    try:
+        task = Task.objects.get(pk=task_id)
+        assignee = User.objects.get(pk=user_id)
+    except (Task.DoesNotExist, User.DoesNotExist):
+        logger.warning(f"Skipping unassignment notification for task {task_id}, user {user_id}: not found")
+        return
+
+    Notification.objects.create(
+        user=assignee,
+        message=f"You've been unassigned from task: {task.title}"
+    )
+
+
+@shared_task(ignore_result=True)
+def prune_notifications():
+    """Periodic retention job; see the prune_notifications management command"""
+    from django.core.management import call_command
+
+    call_command('prune_notifications')
+
+
+@shared_task(ignore_result=True)
+def drain_push_outbox():
+    """Deliver due pushes from the outbox until none are left"""
+    from .outbox import OUTBOX_BATCH_SIZE, drain_outbox
+
+    while drain_outbox()['claimed'] == OUTBOX_BATCH_SIZE:
+        pass
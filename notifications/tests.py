@@ -0,0 +1,518 @@
+import threading
+import time
+from io import StringIO
+from datetime import datetime, timedelta, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from task_mangement_api.serialization import ValuesSerializer
+from .fcm_utils import FCM_BATCH_SIZE, send_to_tokens
+from .models import DeviceToken, Notification, NotificationCounter, PushOutbox
+from .outbox import (
+    OUTBOX_BACKOFF_BASE, OUTBOX_BACKOFF_MAX, OUTBOX_LEASE, OUTBOX_MAX_ATTEMPTS,
+    backoff_delay, drain_outbox, enqueue_push, outbox_metrics,
+)
+from .serializers import NotificationSerializer
+from .views import authenticate_stream
+
+User = get_user_model()
+
+
+class StreamAuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_stream_token(self):
+        response = self.client.post('/api/v1/notifications/stream-token/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['expires_in'], 60)
+        return response.json()['token']
+
+    def authenticate(self, **kwargs):
+        return authenticate_stream(RequestFactory().get('/api/v1/notifications/stream/', **kwargs))
+
+    def test_stream_token(self):
+        self.assertEqual(self.authenticate(data={'token': self.get_stream_token()}), self.user)
+
+    def test_authorization_header(self):
+        header = f'Bearer {AccessToken.for_user(self.user)}'
+        self.assertEqual(self.authenticate(HTTP_AUTHORIZATION=header), self.user)
+
+    def test_access_token_is_not_accepted_in_the_query_string(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(data={'token': str(AccessToken.for_user(self.user))})
+
+    def test_rejected_tokens(self):
+        token = self.get_stream_token()
+        # Expired
+        with mock.patch('time.time', return_value=time.time() + 61):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(data={'token': token})
+        # Signed for another purpose
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(data={'token': signing.dumps(self.user.id)})
+        # Issued to a user who has since been deactivated
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(data={'token': token})
+
+    @override_settings(NOTIFICATION_STREAM_MAX_AGE=0)
+    async def test_stream_opens_with_a_stream_token(self):
+        client = AsyncClient()
+        access_token = await sync_to_async(AccessToken.for_user)(self.user)
+        response = await client.get(f'/api/v1/notifications/stream/?token={access_token}')
+        self.assertEqual(response.status_code, 401)
+
+        stream_token = await sync_to_async(self.get_stream_token)()
+        response = await client.get(f'/api/v1/notifications/stream/?token={stream_token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+
+class NotificationSerializationTests(TestCase):
+    """NotificationListView's .values() fast path renders exactly what NotificationSerializer renders"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        notifications = Notification.objects.bulk_create([
+            Notification(user=self.user, message='Plain'),
+            Notification(user=self.user, message='', read_status=True),
+            Notification(user=self.user, message='Line\u2028separator, "quotes" and \u00e9'),
+        ])
+        Notification.objects.filter(pk=notifications[0].pk).update(
+            created_at=datetime(2026, 3, 1, 23, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        )
+
+    def assert_equivalent(self):
+        notifications = Notification.objects.filter(user=self.user)
+        expected = NotificationSerializer(notifications, many=True).data
+        serializer = ValuesSerializer(NotificationSerializer())
+        actual = serializer.to_representation(notifications.values(*serializer.columns))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+        # And the endpoint serves those items in inbox order
+        self.assertEqual(self.client.get('/api/v1/notifications/').json()['results'], expected)
+
+    def test_equivalent(self):
+        self.assert_equivalent()
+
+    def test_equivalent_in_another_timezone(self):
+        with timezone.override('Asia/Phnom_Penh'):
+            self.assert_equivalent()
+
+
+class NotificationCounterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assert_counted(self):
+        unread = Notification.objects.filter(user=self.user, read_status=False).count()
+        self.assertEqual(NotificationCounter.get_count(self.user), unread)
+        self.assertEqual(self.client.get('/api/v1/notifications/unread-count/').json(), {'unread_count': unread})
+
+    def test_adjust_creates_a_missing_row(self):
+        other = User.objects.create_user('other', 'other@example.com', 'pw')
+        self.assertFalse(NotificationCounter.objects.filter(user=self.user).exists())
+        self.assertEqual(NotificationCounter.get_count(self.user), 0)
+
+        NotificationCounter.adjust(self.user.id, 3)
+        self.assertEqual(NotificationCounter.objects.get(user=self.user).unread_count, 3)
+        NotificationCounter.adjust(self.user.id, -5)
+        self.assertEqual(NotificationCounter.objects.get(user=self.user).unread_count, 0)
+        NotificationCounter.adjust(other.id, -1)
+        self.assertEqual(NotificationCounter.objects.get(user=other).unread_count, 0)
+
+    def test_lock_for_user_creates_a_missing_row_at_zero(self):
+        with transaction.atomic():
+            self.assertEqual(NotificationCounter.lock_for_user(self.user).unread_count, 0)
+        self.assertTrue(NotificationCounter.objects.filter(user=self.user).exists())
+
+    def test_counter_tracks_writes(self):
+        first = Notification.objects.create(user=self.user, message='First')
+        self.assertEqual(NotificationCounter.objects.get(user=self.user).unread_count, 1)
+        notifications = Notification.objects.bulk_create([
+            Notification(user=self.user, message=f'Bulk {i}', read_status=i == 0) for i in range(4)
+        ])
+        self.assert_counted()
+
+        self.client.patch(f'/api/v1/notifications/{first.id}/read/')
+        self.assert_counted()
+        self.client.post('/api/v1/notifications/mark-read/', {'ids': [notifications[1].id]}, format='json')
+        self.assert_counted()
+        self.client.post('/api/v1/notifications/bulk-delete/', {'ids': [notifications[2].id]}, format='json')
+        self.assert_counted()
+        self.assertEqual(NotificationCounter.get_count(self.user), 1)
+
+
+class FakeMessaging:
+    """
+    Stand-in for firebase_admin.messaging; the token prefix picks the outcome:
+    ``dead`` and ``sender`` tokens are permanently invalid, ``bad`` tokens fail
+    transiently, anything else is delivered
+    """
+    class UnregisteredError(Exception):
+        pass
+
+    class SenderIdMismatchError(Exception):
+        pass
+
+    class Notification:
+        def __init__(self, title, body):
+            self.title = title
+            self.body = body
+
+    class MulticastMessage:
+        def __init__(self, notification, data, tokens):
+            self.notification = notification
+            self.data = data
+            self.tokens = tokens
+
+    def __init__(self):
+        self.messages = []
+        self.lock = threading.Lock()
+
+    def send_each_for_multicast(self, message):
+        with self.lock:
+            self.messages.append(message)
+        return SimpleNamespace(responses=[self.respond(token) for token in message.tokens])
+
+    def respond(self, token):
+        if token.startswith('dead'):
+            return SimpleNamespace(success=False, message_id=None, exception=self.UnregisteredError(token))
+        if token.startswith('sender'):
+            return SimpleNamespace(success=False, message_id=None, exception=self.SenderIdMismatchError(token))
+        if token.startswith('bad'):
+            return SimpleNamespace(success=False, message_id=None, exception=ValueError('Quota exceeded'))
+        return SimpleNamespace(success=True, message_id=f'message-{token}', exception=None)
+
+
+class PushOutboxMixin:
+    def setUp(self):
+        self.users = [User.objects.create_user(f'user{i}', f'user{i}@example.com', 'pw') for i in range(3)]
+        self.backend = FakeMessaging()
+
+    def add_tokens(self, user, *tokens):
+        DeviceToken.objects.bulk_create([DeviceToken(user=user, token=token) for token in tokens])
+
+    def enqueue(self, user_ids, title='Title', body='Body', data=None):
+        with mock.patch('notifications.outbox.enqueue_on_commit'):
+            return enqueue_push(user_ids, title, body, data)
+
+    def drain_later(self, seconds):
+        """drain_outbox as run ``seconds`` from now"""
+        later = timezone.now() + timedelta(seconds=seconds)
+        with mock.patch('notifications.outbox.timezone.now', return_value=later):
+            return drain_outbox(backend=self.backend)
+
+
+class PushOutboxTestCase(PushOutboxMixin, TestCase):
+    pass
+
+
+class PushDeliveryTests(PushOutboxTestCase):
+    def test_dead_tokens_do_not_count_as_delivered(self):
+        dead_only, dead_and_failing, dead_and_working = self.users
+        self.add_tokens(dead_only, 'dead-a')
+        self.add_tokens(dead_and_failing, 'dead-b', 'bad-b')
+        self.add_tokens(dead_and_working, 'sender-c', 'ok-c')
+        self.enqueue([user.id for user in self.users])
+
+        stats = drain_outbox(backend=self.backend)
+
+        # Only the user whose one live token failed is retried
+        self.assertEqual(stats, {'claimed': 3, 'sent': 2, 'retried': 1, 'failed': 0})
+        row = PushOutbox.objects.get()
+        self.assertEqual((row.user_id, row.last_error), (dead_and_failing.id, 'Quota exceeded'))
+        self.assertEqual(sorted(DeviceToken.objects.values_list('token', flat=True)), ['bad-b', 'ok-c'])
+
+
+class SendToTokensTests(PushOutboxTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.users[0]
+        # Two batches of 500 and one of 1, with a dead token in the first and last
+        self.tokens = [f'ok-{i:04}' for i in range(2 * FCM_BATCH_SIZE + 1)]
+        self.tokens[10] = 'dead-first'
+        self.tokens[-1] = 'sender-last'
+        self.add_tokens(self.user, *self.tokens)
+
+    def send(self, backend=None):
+        pairs = [(token, self.user.id) for token in self.tokens]
+        return send_to_tokens(pairs, 'Title', 'Body', backend=backend or self.backend)
+
+    def test_tokens_are_sent_in_batches(self):
+        report = self.send()
+        self.assertEqual(sorted(len(message.tokens) for message in self.backend.messages), [1, 500, 500])
+        sent = [token for message in self.backend.messages for token in message.tokens]
+        self.assertEqual(sorted(sent), sorted(self.tokens))
+        self.assertEqual((report.success_count, report.failure_count), (len(self.tokens) - 2, 2))
+
+    def test_results_keep_the_token_order(self):
+        backend = self.backend
+        send_each_for_multicast = backend.send_each_for_multicast
+
+        def first_batch_finishes_last(message):
+            if message.tokens[0] == self.tokens[0]:
+                time.sleep(0.2)
+            return send_each_for_multicast(message)
+
+        backend.send_each_for_multicast = first_batch_finishes_last
+        report = self.send(backend)
+        self.assertEqual(backend.messages[-1].tokens[0], self.tokens[0])
+        self.assertEqual([result.token for result in report.results], self.tokens)
+        self.assertEqual([result.message_id for result in report.results[:2]], ['message-ok-0000', 'message-ok-0001'])
+
+    def test_dead_tokens_are_deleted_with_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            report = self.send()
+        self.assertEqual(report.dead_tokens, ['dead-first', 'sender-last'])
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('DELETE'))
+        self.assertEqual(DeviceToken.objects.count(), len(self.tokens) - 2)
+
+    def test_failed_batch(self):
+        backend = self.backend
+        send_each_for_multicast = backend.send_each_for_multicast
+
+        def first_batch_fails(message):
+            if message.tokens[0] == self.tokens[0]:
+                raise ConnectionError('FCM unavailable')
+            return send_each_for_multicast(message)
+
+        backend.send_each_for_multicast = first_batch_fails
+        report = self.send(backend)
+        failed = report.results[:FCM_BATCH_SIZE]
+        self.assertEqual({result.error for result in failed}, {'FCM unavailable'})
+        # The dead token in the failed batch was never answered, so it is kept
+        self.assertFalse(any(result.dead for result in failed))
+        self.assertTrue(all(result.success for result in report.results[FCM_BATCH_SIZE:-1]))
+        self.assertEqual(report.dead_tokens, ['sender-last'])
+        self.assertTrue(DeviceToken.objects.filter(token='dead-first').exists())
+
+
+class PushOutboxEnqueueTests(PushOutboxTestCase):
+    def test_identical_pending_pushes_collapse(self):
+        user_ids = [user.id for user in self.users]
+        self.assertEqual(self.enqueue(user_ids, data={'task_id': '1'}), 3)
+        # Collapsed users still count: the push is pending for them
+        self.assertEqual(self.enqueue(user_ids[:2] + user_ids[:1], data={'task_id': '1'}), 2)
+        self.assertEqual(PushOutbox.objects.count(), 3)
+
+        self.enqueue(user_ids[:1], data={'task_id': '2'})
+        self.enqueue(user_ids[:1], title='Other', data={'task_id': '1'})
+        self.assertEqual(PushOutbox.objects.filter(user_id=user_ids[0]).count(), 3)
+
+        # A failed push no longer holds back an identical new one
+        PushOutbox.objects.filter(user_id=user_ids[1]).update(status=PushOutbox.Status.FAILED)
+        self.enqueue(user_ids[1:2], data={'task_id': '1'})
+        self.assertEqual(PushOutbox.objects.filter(user_id=user_ids[1]).count(), 2)
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=False)
+    @mock.patch('notifications.outbox.CELERY_AVAILABLE', True)
+    def test_drain_is_queued_on_commit(self):
+        with mock.patch('notifications.tasks.drain_push_outbox.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                enqueue_push([self.users[0].id], 'Title', 'Body')
+                self.assertFalse(delay.called)
+        delay.assert_called_once_with()
+        self.assertEqual(enqueue_push([], 'Title', 'Body'), 0)
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_eager_jobs_leave_the_drain_to_the_command(self):
+        with mock.patch('notifications.tasks.drain_push_outbox.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                enqueue_push([self.users[0].id], 'Title', 'Body')
+        self.assertEqual(callbacks, [])
+        self.assertFalse(delay.called)
+        self.assertEqual(PushOutbox.objects.count(), 1)
+
+
+class PushOutboxDrainTests(PushOutboxTestCase):
+    def test_identical_pushes_are_sent_as_one_multicast(self):
+        self.add_tokens(self.users[0], 'ok-a1', 'ok-a2')
+        self.add_tokens(self.users[1], 'ok-b')
+        self.enqueue([self.users[0].id, self.users[1].id], data={'task_id': '1'})
+        self.enqueue([self.users[0].id], data={'task_id': '2'})
+
+        self.assertEqual(drain_outbox(backend=self.backend), {'claimed': 3, 'sent': 3, 'retried': 0, 'failed': 0})
+        self.assertEqual(
+            sorted(sorted(message.tokens) for message in self.backend.messages),
+            [['ok-a1', 'ok-a2'], ['ok-a1', 'ok-a2', 'ok-b']],
+        )
+        self.assertFalse(PushOutbox.objects.exists())
+
+    def test_failed_push_is_retried_with_backoff(self):
+        self.add_tokens(self.users[0], 'bad-a')
+        self.enqueue([self.users[0].id])
+        before = timezone.now()
+
+        self.assertEqual(drain_outbox(backend=self.backend)['retried'], 1)
+        row = PushOutbox.objects.get()
+        self.assertEqual((row.status, row.attempts, row.last_error), (PushOutbox.Status.PENDING, 1, 'Quota exceeded'))
+        self.assertFalse(row.leased)
+        # First retry waits between half and all of the base delay
+        self.assertGreaterEqual(row.next_attempt_at, before + timedelta(seconds=OUTBOX_BACKOFF_BASE / 2))
+        self.assertLessEqual(row.next_attempt_at, timezone.now() + timedelta(seconds=OUTBOX_BACKOFF_BASE))
+
+        # Not due yet
+        self.assertEqual(drain_outbox(backend=self.backend)['claimed'], 0)
+        self.assertEqual(self.drain_later(OUTBOX_BACKOFF_BASE)['retried'], 1)
+        self.assertEqual(PushOutbox.objects.get().attempts, 2)
+
+    def test_push_fails_after_max_attempts(self):
+        self.add_tokens(self.users[0], 'bad-a')
+        self.enqueue([self.users[0].id])
+        PushOutbox.objects.update(attempts=OUTBOX_MAX_ATTEMPTS - 1)
+
+        with self.assertLogs('notifications.outbox', 'ERROR'):
+            self.assertEqual(drain_outbox(backend=self.backend)['failed'], 1)
+        row = PushOutbox.objects.get()
+        self.assertEqual((row.status, row.attempts), (PushOutbox.Status.FAILED, OUTBOX_MAX_ATTEMPTS))
+        self.assertEqual(self.drain_later(OUTBOX_BACKOFF_MAX)['claimed'], 0)
+
+    def test_claimed_rows_are_leased(self):
+        self.add_tokens(self.users[0], 'ok-a')
+        self.enqueue([self.users[0].id])
+
+        def crash(rows, backend):
+            # A second drain while the first is sending finds nothing to claim
+            self.assertEqual(drain_outbox(backend=backend)['claimed'], 0)
+            raise RuntimeError('Worker died')
+
+        with mock.patch('notifications.outbox.deliver', crash):
+            with self.assertRaises(RuntimeError):
+                drain_outbox(backend=self.backend)
+        row = PushOutbox.objects.get()
+        self.assertEqual((row.attempts, row.leased), (1, True))
+
+        # The crashed worker's row comes back once its lease expires
+        self.assertEqual(self.drain_later(OUTBOX_LEASE.total_seconds() - 5)['claimed'], 0)
+        self.assertEqual(self.drain_later(OUTBOX_LEASE.total_seconds() + 5)['sent'], 1)
+
+    def test_without_a_backend_rows_are_retried(self):
+        self.enqueue([self.users[0].id])
+        with mock.patch('notifications.fcm_utils.get_messaging_backend', return_value=None):
+            self.assertEqual(drain_outbox()['retried'], 1)
+        self.assertEqual(PushOutbox.objects.get().last_error, "FCM is not configured")
+
+
+class PushOutboxBackoffTests(TestCase):
+    def test_backoff_doubles_up_to_the_cap(self):
+        for attempts in range(1, 15):
+            ceiling = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1))
+            delays = [backoff_delay(attempts) for _ in range(50)]
+            self.assertTrue(all(ceiling / 2 <= delay <= ceiling for delay in delays), (attempts, delays))
+            # Jittered: rows that failed together do not retry together
+            self.assertGreater(len(set(delays)), 1)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'SKIP LOCKED is checked on PostgreSQL')
+class PushOutboxConcurrencyTests(PushOutboxMixin, TransactionTestCase):
+    def test_rows_locked_by_another_worker_are_skipped(self):
+        self.add_tokens(self.users[0], 'ok-a')
+        self.add_tokens(self.users[1], 'ok-b')
+        self.enqueue([self.users[0].id, self.users[1].id])
+        locked = PushOutbox.objects.get(user=self.users[0])
+        claimed = threading.Event()
+        release = threading.Event()
+
+        def other_worker():
+            # Holds a row lock the way a worker does while claiming its batch
+            try:
+                with transaction.atomic():
+                    list(PushOutbox.objects.filter(pk=locked.pk).select_for_update())
+                    claimed.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=other_worker)
+        thread.start()
+        try:
+            self.assertTrue(claimed.wait(10))
+            self.assertEqual(drain_outbox(backend=self.backend), {'claimed': 1, 'sent': 1, 'retried': 0, 'failed': 0})
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(list(PushOutbox.objects.values_list('pk', flat=True)), [locked.pk])
+
+
+class PushOutboxMetricsTests(PushOutboxTestCase):
+    def test_metrics(self):
+        self.assertEqual(outbox_metrics(), {
+            'pending': 0, 'due': 0, 'sending': 0, 'retrying': 0, 'failed': 0,
+            'oldest_pending_age_seconds': 0, 'lag_seconds': 0,
+        })
+        self.users += [User.objects.create_user(f'user{i}', f'user{i}@example.com', 'pw') for i in (3, 4)]
+        self.enqueue([user.id for user in self.users])
+        now = timezone.now()
+        PushOutbox.objects.filter(user=self.users[0]).update(
+            next_attempt_at=now - timedelta(seconds=120), created_at=now - timedelta(seconds=300)
+        )
+        # Waiting out its backoff
+        PushOutbox.objects.filter(user=self.users[1]).update(next_attempt_at=now + timedelta(seconds=60), attempts=2)
+        PushOutbox.objects.filter(user=self.users[2]).update(status=PushOutbox.Status.FAILED)
+        # First attempt in flight: sending, not retrying
+        PushOutbox.objects.filter(user=self.users[3]).update(
+            next_attempt_at=now + OUTBOX_LEASE, attempts=1, leased=True
+        )
+        # Its drainer crashed and the lease ran out: due for a retry
+        PushOutbox.objects.filter(user=self.users[4]).update(
+            next_attempt_at=now - timedelta(seconds=10), attempts=1, leased=True
+        )
+
+        metrics = outbox_metrics()
+        self.assertEqual(
+            (metrics['pending'], metrics['due'], metrics['sending'], metrics['retrying'], metrics['failed']),
+            (4, 2, 1, 2, 1),
+        )
+        self.assertGreaterEqual(metrics['lag_seconds'], 120)
+        self.assertGreaterEqual(metrics['oldest_pending_age_seconds'], 300)
+
+        admin = User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(self.users[0])
+        self.assertEqual(client.get('/api/v1/admin/push-outbox/').status_code, 403)
+        client.force_authenticate(admin)
+        response = client.get('/api/v1/admin/push-outbox/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['pending'], 4)
+
+
+class PruneNotificationsTests(PushOutboxTestCase):
+    def test_failed_pushes_are_pruned(self):
+        self.enqueue([user.id for user in self.users])
+        old = timezone.now() - timedelta(days=100)
+        failed_old, pending_old, failed_new = PushOutbox.objects.order_by('user_id')
+        PushOutbox.objects.filter(pk=failed_old.pk).update(status=PushOutbox.Status.FAILED, created_at=old)
+        PushOutbox.objects.filter(pk=pending_old.pk).update(created_at=old)
+        PushOutbox.objects.filter(pk=failed_new.pk).update(status=PushOutbox.Status.FAILED)
+        Notification.objects.create(user=self.users[0], message='Read', read_status=True)
+        Notification.objects.filter(user=self.users[0]).update(created_at=old)
+
+        out = StringIO()
+        call_command('prune_notifications', '--days=90', '--dry-run', stdout=out)
+        self.assertIn('1 read notifications and 1 failed pushes', out.getvalue())
+        self.assertEqual(PushOutbox.objects.count(), 3)
+
+        call_command('prune_notifications', '--days=90', stdout=StringIO())
+        self.assertEqual(sorted(PushOutbox.objects.values_list('pk', flat=True)), [pending_old.pk, failed_new.pk])
+        self.assertFalse(Notification.objects.exists())
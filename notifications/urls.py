@@ -3,6 +3,11 @@ from . import views
 
 urlpatterns = [
     path('', views.NotificationListView.as_view(), name='notification-list'),
+    path('unread-count/', views.UnreadCountView.as_view(), name='notification-unread-count'),
+    path('mark-read/', views.BulkMarkAsReadView.as_view(), name='notification-mark-read'),
+    path('bulk-delete/', views.BulkDeleteView.as_view(), name='notification-bulk-delete'),
     path('<int:pk>/read/', views.MarkAsReadView.as_view(), name='notification-read'),
+    path('stream/', views.NotificationStreamView.as_view(), name='notification-stream'),
+    path('stream-token/', views.StreamTokenView.as_view(), name='notification-stream-token'),
     path('register-token/', views.RegisterTokenView.as_view(), name='register-token'),
 ]
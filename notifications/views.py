@@ -1,30 +1,251 @@
-from rest_framework import permissions, status
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Notification, DeviceToken
-from .serializers import NotificationSerializer, DeviceTokenSerializer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from task_mangement_api.serialization import ValuesSerializer
+from .broker import get_broker
+from .events import RESYNC_EVENT, format_event, format_notification
+from .models import Notification, NotificationCounter, DeviceToken
+from .pagination import NotificationCursorPagination
+from .serializers import NotificationSerializer, NotificationSelectionSerializer, DeviceTokenSerializer
+
+User = get_user_model()
+
 
+class NotificationListView(generics.ListAPIView):
+    """Inbox, newest first, cursor paginated; ``?unread_only=true`` limits it to unread notifications"""
+    serializer_class = NotificationSerializer
+    pagination_class = NotificationCursorPagination
+
+    def get_queryset(self):
+        queryset = Notification.objects.filter(user=self.request.user)
+        if self.get_unread_only():
+            queryset = queryset.filter(read_status=False)
+        return queryset
+
+    def get_unread_only(self):
+        value = self.request.query_params.get('unread_only')
+        if value is None:
+            return False
+        try:
+            return serializers.BooleanField().to_internal_value(value)
+        except ValidationError:
+            raise ValidationError({'unread_only': ['Must be a boolean.']})
 
-class NotificationListView(APIView):
+    def list(self, request, *args, **kwargs):
+        # Read-only fast path: render plain rows instead of model instances
+        serializer = ValuesSerializer(self.get_serializer())
+        page = self.paginate_queryset(self.get_queryset().values(*serializer.columns))
+        return self.get_paginated_response(serializer.to_representation(page))
+
+
+class UnreadCountView(APIView):
     def get(self, request):
-        qs = Notification.objects.filter(user=request.user).order_by('-created_at')
-        return Response(NotificationSerializer(qs, many=True).data)
+        return Response({"unread_count": NotificationCounter.get_count(request.user)})
 
 
 class MarkAsReadView(APIView):
     def patch(self, request, pk: int):
-        try:
-            notif = Notification.objects.get(pk=pk, user=request.user)
-        except Notification.DoesNotExist:
-            return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
-        notif.read_status = True
-        notif.save(update_fields=["read_status"])
+        notifications = Notification.objects.filter(pk=pk, user=request.user)
+        with transaction.atomic():
+            # Conditional update: only a notification that was unread moves the counter
+            if notifications.filter(read_status=False).update(read_status=True):
+                NotificationCounter.adjust(request.user.id, -1)
+            elif not notifications.exists():
+                return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
         return Response({"message": "Marked as read"})
 
 
+def get_selected_notifications(request):
+    """The requesting user's notifications chosen by a NotificationSelectionSerializer body"""
+    ser = NotificationSelectionSerializer(data=request.data)
+    ser.is_valid(raise_exception=True)
+    selection = ser.validated_data
+    notifications = Notification.objects.filter(user=request.user)
+
+    if 'ids' in selection:
+        return notifications.filter(id__in=selection['ids'])
+    if 'up_to_id' in selection:
+        marker = notifications.filter(id=selection['up_to_id']).values('created_at').first()
+        if marker is None:
+            return notifications.none()
+        return notifications.filter(
+            Q(created_at__lt=marker['created_at'])
+            | Q(created_at=marker['created_at'], id__lte=selection['up_to_id'])
+        )
+    return notifications
+
+
+class BulkMarkAsReadView(APIView):
+    """Mark many notifications read with one set-based UPDATE"""
+    def post(self, request):
+        notifications = get_selected_notifications(request)
+        with transaction.atomic():
+            updated = notifications.filter(read_status=False).update(read_status=True)
+            if updated:
+                NotificationCounter.adjust(request.user.id, -updated)
+        return Response({"updated": updated})
+
+
+class BulkDeleteView(APIView):
+    """Delete many notifications with set-based DELETEs"""
+    def post(self, request):
+        notifications = get_selected_notifications(request)
+        with transaction.atomic():
+            # Unread rows first, so the counter drops by exactly what was deleted even
+            # if some are marked read concurrently
+            unread_deleted, _ = notifications.filter(read_status=False).delete()
+            read_deleted, _ = notifications.delete()
+            if unread_deleted:
+                NotificationCounter.adjust(request.user.id, -unread_deleted)
+        return Response({"deleted": unread_deleted + read_deleted})
+
+
 class RegisterTokenView(APIView):
     def post(self, request):
         ser = DeviceTokenSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
         DeviceToken.objects.update_or_create(user=request.user, token=ser.validated_data['token'])
         return Response({"message": "Token registered"})
+
+
+# Reconnect delay suggested to EventSource clients, in milliseconds
+STREAM_RETRY_MS = 3000
+# Notifications replayed after a reconnect before the client is told to resync instead
+STREAM_REPLAY_LIMIT = 100
+# Stream tokens are signed with their own salt, so no other signed value opens a stream
+STREAM_TOKEN_SALT = 'notifications.stream'
+
+
+def get_stream_token_max_age():
+    return getattr(settings, 'NOTIFICATION_STREAM_TOKEN_MAX_AGE', 60)
+
+
+class StreamTokenView(APIView):
+    """
+    Short-lived token for opening the notification stream as ``?token=``.
+
+    Browsers' EventSource cannot send headers; this keeps the access token out of
+    the URL, and so out of access and proxy logs. Fetch a new one before each
+    connection: a stream token only opens streams, and only until it expires.
+    """
+    def post(self, request):
+        max_age = get_stream_token_max_age()
+        return Response({
+            "token": signing.dumps(request.user.id, salt=STREAM_TOKEN_SALT),
+            "expires_in": max_age,
+        })
+
+
+def authenticate_stream(request):
+    """
+    User for a stream request, from the Authorization header or a stream token
+    in ``?token=``; access tokens are not accepted in the query string
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is not None:
+        raw_token = authentication.get_raw_token(header)
+        if not raw_token:
+            raise AuthenticationFailed("Authentication credentials were not provided.")
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+
+    token = request.GET.get('token')
+    if not token:
+        raise AuthenticationFailed("Authentication credentials were not provided.")
+    try:
+        user_id = signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=get_stream_token_max_age())
+    except signing.BadSignature:
+        raise AuthenticationFailed("Stream token is invalid or expired.")
+    user = User.objects.filter(pk=user_id, is_active=True).first()
+    if user is None:
+        raise AuthenticationFailed("User not found or inactive.")
+    return user
+
+
+class NotificationStreamView(View):
+    """
+    Live notifications and task change events as server-sent events.
+
+    Requires an ASGI server: each open stream holds a coroutine, not a worker.
+    A reconnecting client sends Last-Event-ID and gets the notifications it
+    missed; when too many were missed, or its buffer overflowed, it gets a
+    ``resync`` event and should reload the inbox. Streams end after
+    ``NOTIFICATION_STREAM_MAX_AGE`` seconds and clients reconnect, so a
+    disconnected client's stream is never held for long.
+
+    Authenticate with the Authorization header, or with ``?token=`` holding a
+    token from StreamTokenView. Stream tokens expire after
+    ``NOTIFICATION_STREAM_TOKEN_MAX_AGE`` seconds, so EventSource clients fetch
+    a fresh one and reopen the stream when it ends instead of relying on the
+    automatic reconnect.
+    """
+    http_method_names = ['get']
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "The notification stream requires the ASGI application."},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        try:
+            user = await sync_to_async(authenticate_stream)(request)
+        except AuthenticationFailed as e:
+            return JsonResponse({"detail": str(e.detail)}, status=status.HTTP_401_UNAUTHORIZED)
+
+        try:
+            last_event_id = int(request.headers.get('Last-Event-ID', ''))
+        except ValueError:
+            last_event_id = None
+
+        response = StreamingHttpResponse(self.stream(user, last_event_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, user, last_event_id):
+        loop = asyncio.get_running_loop()
+        keepalive = getattr(settings, 'NOTIFICATION_STREAM_KEEPALIVE', 15)
+        deadline = loop.time() + getattr(settings, 'NOTIFICATION_STREAM_MAX_AGE', 300)
+        broker = get_broker()
+        # Subscribe before the replay query so nothing created in between is lost
+        subscription = broker.subscribe(user.id)
+        try:
+            yield f'retry: {STREAM_RETRY_MS}\n\n'
+            if last_event_id is not None:
+                for frame in await sync_to_async(self.replay)(user, last_event_id):
+                    yield frame
+
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    frame = await subscription.get(min(keepalive, remaining))
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                if subscription.overflowed:
+                    subscription.clear()
+                    frame = format_event(RESYNC_EVENT, {'reason': 'overflow'})
+                yield frame
+        finally:
+            broker.unsubscribe(subscription)
+
+    def replay(self, user, last_event_id):
+        notifications = list(
+            Notification.objects.filter(user=user, id__gt=last_event_id).order_by('id')[:STREAM_REPLAY_LIMIT + 1]
+        )
+        if len(notifications) > STREAM_REPLAY_LIMIT:
+            return [format_event(RESYNC_EVENT, {'reason': 'replay_limit'})]
+        return [format_notification(notification) for notification in notifications]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0004_paymenttransaction_payment_provider_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymenttransaction',
+            name='khqr_transaction_id',
+            field=models.CharField(blank=True, db_index=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='khqr_transaction_id',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='paymenttransaction',
+            name='payment_provider',
+            field=models.CharField(choices=[('stripe', 'Stripe'), ('paypal', 'PayPal'), ('khqr', 'KHQR')], db_index=True, default='stripe', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='subscription',
+            name='payment_provider',
+            field=models.CharField(blank=True, choices=[('stripe', 'Stripe'), ('paypal', 'PayPal'), ('khqr', 'KHQR')], db_index=True, max_length=10, null=True),
+        ),
+    ]
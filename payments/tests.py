@@ -0,0 +1,52 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from task_mangement_api.serialization import ValuesSerializer
+from .models import PaymentTransaction
+from .serializers import PaymentTransactionSerializer
+
+User = get_user_model()
+
+
+class PaymentHistorySerializationTests(TestCase):
+    """PaymentHistoryView's .values() fast path renders exactly what PaymentTransactionSerializer renders"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('payer', 'payer@example.com', 'pw')
+        payments = [
+            PaymentTransaction(user=self.user, amount=Decimal('9.99'), stripe_session_id='cs_test_1', status='completed'),
+            PaymentTransaction(
+                user=self.user, payment_provider=PaymentTransaction.PaymentProvider.PAYPAL, paypal_order_id='PO-1',
+                amount=Decimal('0'), currency='eur',
+            ),
+            PaymentTransaction(
+                user=self.user, payment_provider=PaymentTransaction.PaymentProvider.KHQR,
+                amount=Decimal('12345678.50'), status='failed',
+            ),
+        ]
+        PaymentTransaction.objects.bulk_create(payments)
+        # Microseconds, and a timestamp that falls on another date once converted
+        PaymentTransaction.objects.filter(pk=payments[0].pk).update(
+            created_at=datetime.datetime(2026, 3, 1, 23, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+        )
+
+    def assert_equivalent(self):
+        # The queryset PaymentHistoryView serves
+        payments = PaymentTransaction.objects.filter(user=self.user).order_by('-created_at')
+        expected = PaymentTransactionSerializer(payments, many=True).data
+        serializer = ValuesSerializer(PaymentTransactionSerializer())
+        actual = serializer.to_representation(payments.values(*serializer.columns))
+        self.assertEqual(len(actual), 3)
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_equivalent(self):
+        self.assert_equivalent()
+
+    def test_equivalent_in_another_timezone(self):
+        with timezone.override('Asia/Phnom_Penh'):
+            self.assert_equivalent()
@@ -12,6 +12,7 @@ import stripe
 import paypalrestsdk
 import json
 from decimal import Decimal
+from task_mangement_api.serialization import ValuesSerializer
 from .models import Subscription, PaymentTransaction
 from .serializers import SubscriptionSerializer, PaymentTransactionSerializer
 from .khqr_service import KHQRService
@@ -161,8 +162,9 @@ class CancelSubscriptionView(APIView):
 
 class PaymentHistoryView(APIView):
     def get(self, request):
+        serializer = ValuesSerializer(PaymentTransactionSerializer())
         payments = PaymentTransaction.objects.filter(user=request.user).order_by('-created_at')
-        return Response(PaymentTransactionSerializer(payments, many=True).data)
+        return Response(serializer.to_representation(payments.values(*serializer.columns)))
 
 
 class PaymentSuccessView(View):
@@ -2,6 +2,8 @@
 ASGI config for task_mangement_api project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The live notification stream (/api/v1/notifications/stream/) is only served
+here, e.g. ``gunicorn -k uvicorn.workers.UvicornWorker task_mangement_api.asgi``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
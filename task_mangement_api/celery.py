@@ -0,0 +1,16 @@
+"""
+Celery application for background jobs (push notifications and other side effects).
+
+Start a worker with:
+    celery -A task_mangement_api worker -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_mangement_api.settings')
+
+app = Celery('task_mangement_api')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
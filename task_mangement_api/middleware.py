@@ -0,0 +1,177 @@
+"""
+Content-negotiated response compression (brotli when installed, else gzip).
+
+Unlike Django's GZipMiddleware this honours ``q`` values in Accept-Encoding,
+only compresses textual content types above ``COMPRESSION_MIN_SIZE`` bytes and
+compresses streams with one incremental compressor, flushing per chunk so
+streamed exports still arrive progressively.
+
+Strong ETags stay strong: each encoded representation gets its own tag (the
+coding is appended, ``"abc"`` -> ``"abc-gzip"``) and the suffix is stripped
+from If-None-Match / If-Match before the view compares them. A 304 answering
+an encoded tag gets the suffix back, so caches see the validator they stored.
+"""
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Server preference when the client accepts several codings with the same q
+ENCODINGS = ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+COMPRESSIBLE_TYPES = frozenset({
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml',
+})
+# Event streams must reach the client unbuffered
+EXCLUDED_TYPES = frozenset({'text/event-stream'})
+BROTLI_QUALITY = 5
+ETAG_ENCODING_RE = re.compile(r'-(%s)"' % '|'.join(ENCODINGS))
+
+
+def negotiate_encoding(accept_encoding):
+    """Best supported coding for an Accept-Encoding header, or None"""
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, *params = item.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type):
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    if media_type in EXCLUDED_TYPES:
+        return False
+    return (
+        media_type.startswith('text/')
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(('+json', '+xml'))
+    )
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    # Random gzip header padding mitigates BREACH, as in GZipMiddleware
+    return compress_string(content, max_random_bytes=100)
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk"""
+
+    def __init__(self, encoding):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._process, self._flush, self._finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            # wbits=31 writes a gzip container
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._process = compressor.compress
+            self._flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = compressor.flush
+
+    def compress(self, chunk):
+        if isinstance(chunk, str):
+            chunk = chunk.encode(settings.DEFAULT_CHARSET)
+        return self._process(chunk) + self._flush()
+
+    def finish(self):
+        return self._finish()
+
+
+def compress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def process_request(self, request):
+        # Clients revalidate with the encoded tag; views compare against the plain one
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            request._etag_encodings = set(ETAG_ENCODING_RE.findall(request.META['HTTP_IF_NONE_MATCH']))
+        for header in ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MATCH'):
+            if header in request.META:
+                request.META[header] = ETAG_ENCODING_RE.sub('"', request.META[header])
+
+    def process_response(self, request, response):
+        if response.status_code == 304:
+            return self.process_not_modified(request, response)
+        if response.has_header('Content-Encoding') or not is_compressible(response.get('Content-Type', '')):
+            return response
+        min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            # The compressed size is unknown until the stream ends
+            del response.headers['Content-Length']
+        else:
+            compressed_content = compress(response.content, encoding)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(compressed_content))
+
+        etag = response.get('ETag')
+        if etag and etag.endswith('"'):
+            response.headers['ETag'] = f'{etag[:-1]}-{encoding}"'
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def process_not_modified(self, request, response):
+        """Give a 304 the same validator and Vary as the encoded 200 it revalidates"""
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None or encoding not in getattr(request, '_etag_encodings', ()):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        etag = response.get('ETag')
+        if etag and etag.endswith('"'):
+            response.headers['ETag'] = f'{etag[:-1]}-{encoding}"'
+        return response
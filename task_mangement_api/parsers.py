@@ -0,0 +1,49 @@
+"""
+JSON parser backed by orjson when it is installed.
+
+Bodies orjson rejects (e.g. NaN constants) are re-parsed with the stdlib, so
+accepted input and error messages match ``JSONParser``. Bodies that may contain
+integers wider than 64 bits, which orjson would turn into floats, go straight to
+the stdlib.
+"""
+import codecs
+import re
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import json
+
+from .renderers import FastJSONRenderer
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 19+ digits may not fit in a 64-bit integer; matches inside strings only cost the fast path
+LONG_NUMBER_RE = re.compile(rb'\d{19}')
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not ORJSON_AVAILABLE or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if not LONG_NUMBER_RE.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(body.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
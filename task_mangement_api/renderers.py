@@ -0,0 +1,64 @@
+"""
+JSON renderer backed by orjson when it is installed.
+
+orjson is several times faster than the stdlib encoder on large list responses.
+Datetimes, Decimals, lazy strings and other non-JSON types are still converted
+by DRF's JSONEncoder, so the output is the same as ``JSONRenderer`` (floats aside,
+which orjson writes without a '+' in exponents, e.g. 1e16). Requests the
+fast path cannot reproduce byte for byte (indented output, ``UNICODE_JSON`` or
+``COMPACT_JSON`` off, non-strict JSON, integers wider than 64 bits) fall back to
+the stdlib renderer. orjson writes NaN and infinities as null where the strict
+stdlib renderer raises ValueError, so data holding them is also handed to the
+stdlib renderer, which raises as before.
+"""
+import math
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def has_non_finite(data):
+    """True if ``data`` holds a NaN or infinite float or Decimal anywhere"""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, Decimal):
+        return not data.is_finite()
+    if isinstance(data, dict):
+        return any(has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(has_non_finite(value) for value in data)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if not ORJSON_AVAILABLE or indent is not None or self.ensure_ascii or not self.compact or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                # Route datetimes through DRF's encoder so UTC keeps its 'Z' suffix and microseconds
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Non-finite numbers come out as null; only look for them when there is one
+        if b'null' in ret and has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, so the output stays a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
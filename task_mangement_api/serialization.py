@@ -0,0 +1,127 @@
+"""
+Read-only serialization straight from ``.values()`` rows.
+
+DRF resolves every field of every object through ``get_attribute`` and
+``to_representation``, which dominates CPU on the hot list endpoints.
+``ValuesSerializer`` compiles the readable fields of a ModelSerializer once into
+plain converters and applies them to dict rows, producing the same output.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, fields, relations, serializers
+from rest_framework.settings import api_settings
+
+
+def _is_iso_8601(field, default_format):
+    output_format = getattr(field, 'format', default_format)
+    return isinstance(output_format, str) and output_format.lower() == ISO_8601
+
+
+def _compile_datetime(field):
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if field_timezone is None or not _is_iso_8601(field, api_settings.DATETIME_FORMAT):
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _compile_date(field):
+    if not _is_iso_8601(field, api_settings.DATE_FORMAT):
+        return field.to_representation
+    return lambda value: value.isoformat()
+
+
+def _compile_choice(field):
+    choices = field.choice_strings_to_values
+    return lambda value: value if value == '' else choices.get(str(value), value)
+
+
+def compile_field(field):
+    """
+    Converter matching ``field.to_representation`` for a non-None database value,
+    or None for nested serializers and method fields.
+    """
+    if isinstance(field, (serializers.BaseSerializer, fields.SerializerMethodField)):
+        return None
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        # .values() already returns the related primary key
+        return lambda value: value
+    if isinstance(field, fields.DateTimeField):
+        return _compile_datetime(field)
+    if isinstance(field, fields.DateField):
+        return _compile_date(field)
+    if isinstance(field, fields.ChoiceField):
+        return _compile_choice(field)
+    if isinstance(field, fields.BooleanField):
+        return bool
+    if isinstance(field, fields.IntegerField):
+        return int
+    if isinstance(field, fields.FloatField):
+        return float
+    if isinstance(field, fields.CharField):
+        return str
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Render ``.values()`` rows exactly as ``serializer`` renders model instances.
+
+    Flat fields are compiled from ``serializer.fields`` (so sparse fieldsets carry
+    over). Nested serializers and method fields are filled by a subclass method
+    ``get_<field_name>_map(keys)`` returning ``{row key: representation}`` for
+    every key (a ``defaultdict`` for to-many relations).
+    ``prefix`` reads the columns through a relation, e.g. ``'user__'``.
+    """
+    key = 'id'
+
+    def __init__(self, serializer, prefix=''):
+        self.prefix = prefix
+        self.fields = []
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            converter = compile_field(field)
+            if converter is None and not hasattr(self, f'get_{field.field_name}_map'):
+                raise ImproperlyConfigured(
+                    f"{type(self).__name__} cannot render nested field '{field.field_name}'"
+                )
+            if converter is not None and field.source == '*':
+                raise ImproperlyConfigured(f"Field '{field.field_name}' has no source column")
+            column = prefix + field.source.replace('.', '__')
+            self.fields.append((field.field_name, column, converter))
+
+    @property
+    def columns(self):
+        """Arguments for ``.values()``"""
+        columns = [column for _, column, converter in self.fields if converter is not None]
+        key = self.prefix + self.key
+        if key not in columns:
+            columns.append(key)
+        return columns
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        key = self.prefix + self.key
+        nested = {
+            name: getattr(self, f'get_{name}_map')([row[key] for row in rows])
+            for name, _, converter in self.fields if converter is None
+        }
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, converter in self.fields:
+                if converter is None:
+                    item[name] = nested[name][row[key]]
+                    continue
+                value = row[column]
+                item[name] = None if value is None else converter(value)
+            data.append(item)
+        return data
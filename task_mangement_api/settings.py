@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third-party
     'rest_framework',
     'rest_framework_simplejwt',
@@ -57,6 +58,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'task_mangement_api.middleware.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,6 +68,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Responses smaller than this many bytes are not compressed
+COMPRESSION_MIN_SIZE = 1024
+
 ROOT_URLCONF = 'task_mangement_api.urls'
 
 TEMPLATES = [
@@ -155,6 +160,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed JSON when installed, stdlib json otherwise
+    'DEFAULT_RENDERER_CLASSES': (
+        'task_mangement_api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'task_mangement_api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
@@ -262,6 +277,38 @@ CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET', '')
 
 # Firebase Configuration
 FIREBASE_CREDENTIALS_PATH = os.environ.get('FIREBASE_CREDENTIALS_PATH', '')
+# Concurrent FCM batch requests per send
+FCM_MAX_WORKERS = 4
+
+# Celery (background jobs). Without a broker, jobs run eagerly in-process.
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', '')
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Periodic jobs, run by `celery -A task_mangement_api beat`
+CELERY_BEAT_SCHEDULE = {
+    'prune-notifications': {
+        'task': 'notifications.tasks.prune_notifications',
+        'schedule': 24 * 60 * 60,
+    },
+    # Picks up push retries whose backoff has expired
+    'drain-push-outbox': {
+        'task': 'notifications.tasks.drain_push_outbox',
+        'schedule': 30,
+    },
+}
+
+# Read notifications older than this many days are pruned by prune_notifications
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 90))
+
+# Live notification stream (server-sent events, served by the ASGI application).
+# Without a Redis URL events only reach streams held by the process that wrote them.
+NOTIFICATION_BROKER_URL = os.environ.get('NOTIFICATION_BROKER_URL', '')
+NOTIFICATION_STREAM_KEEPALIVE = 15
+NOTIFICATION_STREAM_MAX_AGE = 300
+# Lifetime in seconds of the stream tokens EventSource clients pass as ?token=
+NOTIFICATION_STREAM_TOKEN_MAX_AGE = 60
 
 # Logging Configuration
 LOGGING = {
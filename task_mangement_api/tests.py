@@ -0,0 +1,148 @@
+import datetime
+import gzip
+import io
+import json
+import unittest
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+from .middleware import BROTLI_AVAILABLE
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+
+User = get_user_model()
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', 'owner@example.com', 'pw', is_verified=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Large enough to pass COMPRESSION_MIN_SIZE
+        self.task = Task.objects.create(title='Report', description='quarterly numbers ' * 200, owner=self.user)
+        self.url = f'/api/v1/tasks/{self.task.id}/'
+
+    def test_gzip_response(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].endswith('-gzip"'))
+        self.assertEqual(json.loads(gzip.decompress(response.content))['id'], self.task.id)
+
+    def test_conditional_get_with_gzip(self):
+        etag = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Same validator and Vary as the 200 the cache holds
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        self.task.touch()
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_get_without_encoding(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertFalse(etag.endswith('-gzip"'))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertNotIn('-gzip', response['ETag'])
+
+    @unittest.skipUnless(BROTLI_AVAILABLE, 'brotli is not installed')
+    def test_brotli_preferred(self):
+        import brotli
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertTrue(response['ETag'].endswith('-br"'))
+        self.assertEqual(json.loads(brotli.decompress(response.content))['id'], self.task.id)
+
+        # A lower q value loses to gzip
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br;q=0.5')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    @unittest.skipUnless(BROTLI_AVAILABLE, 'brotli is not installed')
+    def test_brotli_stream(self):
+        import brotli
+
+        from .middleware import compress_stream
+
+        chunks = [b'{"rows": [', b'1, 2, 3' * 100, b']}']
+        data = b''.join(compress_stream(iter(chunks), 'br'))
+        self.assertEqual(brotli.decompress(data), b''.join(chunks))
+
+    @unittest.skipUnless(BROTLI_AVAILABLE, 'brotli is not installed')
+    def test_conditional_get_with_brotli(self):
+        etag = self.client.get(self.url, HTTP_ACCEPT_ENCODING='br')['ETag']
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='br', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """FastJSONRenderer writes the same bytes as JSONRenderer, or fails the same way"""
+
+    def assert_same(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data), data)
+
+    def test_same_output(self):
+        utc = datetime.timezone.utc
+        for data in (
+            {'amount': Decimal('12.50'), 'zero': Decimal('0.00')},
+            {'at': datetime.datetime(2026, 3, 1, 23, 30, 15, 123456, tzinfo=utc)},
+            {'at': datetime.datetime(2026, 3, 1, 23, 30, 15, tzinfo=datetime.timezone(datetime.timedelta(hours=7)))},
+            {'at': datetime.datetime(2026, 3, 1, 23, 30, 15, 500)},
+            {'date': datetime.date(2026, 3, 1), 'time': datetime.time(8, 30), 'wait': datetime.timedelta(seconds=90)},
+            {'label': gettext_lazy('To Do'), 'id': uuid.UUID('12345678-1234-5678-1234-567812345678')},
+            {'text': 'Line\u2028and paragraph\u2029separators, "quotes", \u00e9 and \U0001f600'},
+            {'big': 2 ** 70, 'negative': -2 ** 64, 'int64': 2 ** 63 - 1},
+            {'nested': [{'a': None, 'b': [1.5, True, False]}], 1: 'integer key'},
+            [], {}, 'string', 0,
+        ):
+            self.assert_same(data)
+        self.assertEqual(FastJSONRenderer().render(None), JSONRenderer().render(None))
+
+    def test_non_finite_numbers_are_rejected(self):
+        for value in (float('nan'), float('inf'), -float('inf'), Decimal('NaN')):
+            for data in ({'value': value}, [{'nested': [value]}]):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(data)
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render(data)
+
+
+class FastJSONParserTests(SimpleTestCase):
+    """FastJSONParser accepts and rejects the same bodies as JSONParser"""
+
+    def parse(self, parser_class, body):
+        return parser_class().parse(io.BytesIO(body))
+
+    def test_same_result(self):
+        for body in (
+            b'{"title": "Report", "ids": [1, 2, 3], "done": false, "due": null}',
+            b'{"big": 123456789012345678901234567890, "negative": -9223372036854775809}',
+            b'{"precise": 0.1, "exponent": 1e16}',
+            '{"text": "\u00e9 \u2028 \U0001f600"}'.encode(),
+            b'{"escaped": "\\u00e9\\ud83d\\ude00"}',
+            b'[1, "two"]', b'"string"', b'  {"spaced" : 1}  ',
+        ):
+            self.assertEqual(self.parse(FastJSONParser, body), self.parse(JSONParser, body), body)
+
+    def test_same_errors(self):
+        for body in (b'', b'   ', b'{', b'{"a": }', b"{'single': 1}", b'[1, 2,]', b'{"a": NaN}', b'Infinity', b'\xff'):
+            with self.assertRaises(ParseError) as expected:
+                self.parse(JSONParser, body)
+            with self.assertRaises(ParseError) as actual:
+                self.parse(FastJSONParser, body)
+            self.assertEqual(str(actual.exception.detail), str(expected.exception.detail), body)
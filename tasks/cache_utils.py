@@ -0,0 +1,33 @@
+"""Per-user caching of task data, invalidated when a user's tasks or assignments change"""
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .events import task_audience
+
+# Seconds a user's task summary is cached
+TASK_SUMMARY_CACHE_TTL = 300
+
+
+def task_summary_cache_key(user_id):
+    # The date is part of the key because overdue / due today counts roll over at midnight
+    return f"tasks:summary:{user_id}:{timezone.localdate().isoformat()}"
+
+
+def invalidate_task_summaries(user_ids):
+    """Drop the cached summaries of ``user_ids`` once the current transaction commits"""
+    keys = [task_summary_cache_key(user_id) for user_id in set(user_ids)]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_task_summaries_for_tasks(tasks):
+    """
+    Invalidate the summaries of the owners and assignees of ``tasks``
+
+    Returns:
+        dict: user ID -> task IDs, as ``task_audience``
+    """
+    audience = task_audience(tasks)
+    invalidate_task_summaries(audience)
+    return audience
@@ -0,0 +1,40 @@
+"""Live task change events for the notification stream"""
+from collections import defaultdict
+
+from notifications.events import format_event, publish_frames_on_commit
+from .models import TaskAssignment
+
+# Tasks created, edited, assigned or with changed media; clients refetch the ids
+TASK_CHANGED_EVENT = 'task.changed'
+# Tasks deleted or no longer assigned to the user; clients drop the ids
+TASK_REMOVED_EVENT = 'task.removed'
+
+
+def task_audience(tasks):
+    """
+    Map the owner and every assignee of ``tasks`` to the task IDs they can see
+
+    Returns:
+        dict: user ID -> set of task IDs
+    """
+    audience = defaultdict(set)
+    unloaded = []
+    for task in tasks:
+        audience[task.owner_id].add(task.id)
+        # Reuse assignments prefetched by TaskViewSet.get_queryset
+        if 'assignments' in getattr(task, '_prefetched_objects_cache', {}):
+            for assignment in task.assignments.all():
+                audience[assignment.user_id].add(task.id)
+        else:
+            unloaded.append(task.id)
+    if unloaded:
+        for task_id, user_id in TaskAssignment.objects.filter(task__in=unloaded).values_list('task_id', 'user_id'):
+            audience[user_id].add(task_id)
+    return audience
+
+
+def publish_task_events(audience, event=TASK_CHANGED_EVENT, **data):
+    """Tell each user in ``audience`` (user ID -> task IDs) which of their tasks changed, after commit"""
+    publish_frames_on_commit(
+        (user_id, format_event(event, {'ids': sorted(task_ids), **data})) for user_id, task_ids in audience.items()
+    )
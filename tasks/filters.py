@@ -0,0 +1,115 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .models import TASK_SEARCH_CONFIG, Task
+
+
+class TaskSearchFilter(BaseFilterBackend):
+    """
+    Full-text search over task title and description with ``?q=``.
+
+    Uses web search syntax ("quoted phrases", -exclusions, or) against the GIN-indexed
+    ``search_vector`` and orders matches by relevance. Each match is annotated with
+    ``search_rank`` and ``<mark>``-highlighted title and description snippets.
+    """
+    search_param = 'q'
+
+    def get_search_terms(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if view.action != 'list' or not terms:
+            return queryset
+
+        query = SearchQuery(terms, search_type='websearch', config=TASK_SEARCH_CONFIG)
+        headline_options = {'config': TASK_SEARCH_CONFIG, 'start_sel': '<mark>', 'stop_sel': '</mark>'}
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query),
+            title_highlight=SearchHeadline('title', query, highlight_all=True, **headline_options),
+            description_highlight=SearchHeadline('description', query, max_fragments=2, **headline_options),
+        ).order_by('-search_rank', '-created_at', '-id')
+
+
+class TaskFilterParamsSerializer(serializers.Serializer):
+    """Validates the task list filter query parameters"""
+    class Scope:
+        ALL = 'all'
+        OWNED = 'owned'
+        ASSIGNED = 'assigned'
+        choices = (ALL, OWNED, ASSIGNED)
+
+    status = serializers.ListField(child=serializers.ChoiceField(choices=Task.Status.choices), required=False)
+    priority = serializers.ListField(child=serializers.ChoiceField(choices=Task.Priority.choices), required=False)
+    due_after = serializers.DateField(required=False)
+    due_before = serializers.DateField(required=False)
+    overdue = serializers.BooleanField(required=False, allow_null=True, default=None)
+    scope = serializers.ChoiceField(choices=Scope.choices, required=False, default=Scope.ALL)
+
+    def validate(self, attrs):
+        due_after, due_before = attrs.get('due_after'), attrs.get('due_before')
+        if due_after and due_before and due_after > due_before:
+            raise serializers.ValidationError({'due_before': 'Must not be earlier than due_after.'})
+        return attrs
+
+
+class TaskFilter(BaseFilterBackend):
+    """
+    Server-side filters for the task list.
+
+    ``?status=`` and ``?priority=`` may be repeated, ``?due_after=``/``?due_before=``
+    take ISO dates (inclusive), ``?overdue=true`` selects unfinished tasks past their
+    due date and ``?scope=owned|assigned`` restricts to the caller's own or assigned
+    tasks. Invalid values are rejected with a 400.
+    """
+    def filter_queryset(self, request, queryset, view):
+        if view.action != 'list':
+            return queryset
+
+        params_serializer = TaskFilterParamsSerializer(data=request.query_params)
+        params_serializer.is_valid(raise_exception=True)
+        params = params_serializer.validated_data
+
+        if params.get('status'):
+            queryset = queryset.filter(status__in=params['status'])
+        if params.get('priority'):
+            queryset = queryset.filter(priority__in=params['priority'])
+        if params.get('due_after'):
+            queryset = queryset.filter(due_date__gte=params['due_after'])
+        if params.get('due_before'):
+            queryset = queryset.filter(due_date__lte=params['due_before'])
+
+        if params['overdue'] is not None:
+            overdue = Q(due_date__lt=timezone.localdate()) & ~Q(status=Task.Status.DONE)
+            queryset = queryset.filter(overdue) if params['overdue'] else queryset.exclude(overdue)
+
+        scope = params['scope']
+        if scope == TaskFilterParamsSerializer.Scope.OWNED:
+            queryset = queryset.filter(owner=request.user)
+        elif scope == TaskFilterParamsSerializer.Scope.ASSIGNED:
+            # is_assignee is annotated by Task.objects.visible_to()
+            queryset = queryset.filter(is_assignee=True)
+        return queryset
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """Whitelisted ``?ordering=`` for the task list, with ``id`` as a stable tie-breaker"""
+    ordering_fields = ('created_at', 'updated_at', 'due_date', 'title')
+
+    def filter_queryset(self, request, queryset, view):
+        if view.action != 'list':
+            return queryset
+        return super().filter_queryset(request, queryset, view)
+
+    def get_ordering(self, request, queryset, view):
+        # Cursor paginators of other actions also consult the view's ordering filter
+        if view.action != 'list':
+            return None
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        tie_breaker = '-id' if ordering[0].startswith('-') else 'id'
+        return [*ordering, tie_breaker]
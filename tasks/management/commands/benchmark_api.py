@@ -0,0 +1,139 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from admin_api.views import iter_csv
+from notifications.models import Notification
+from notifications.serializers import NotificationSerializer
+from payments.models import PaymentTransaction
+from payments.serializers import PaymentTransactionSerializer
+from task_mangement_api.middleware import ENCODINGS, compress
+from task_mangement_api.renderers import ORJSON_AVAILABLE, FastJSONRenderer
+from task_mangement_api.serialization import ValuesSerializer
+from tasks.models import MediaFile, Task, TaskAssignment
+from tasks.serializers import TaskSerializer, TaskValuesSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the list endpoint hot paths on generated rows: DRF serializers against the '
+        '.values() fast path, and JSONRenderer against FastJSONRenderer. Each pair is checked '
+        'for byte-identical output before timing. Also reports the bytes saved by response '
+        'compression. All generated data is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200, help='Rows per endpoint')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs; the fastest is reported')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+
+        if not ORJSON_AVAILABLE:
+            self.stdout.write(self.style.WARNING('orjson is not installed; FastJSONRenderer uses stdlib json'))
+
+        with transaction.atomic():
+            user = self.create_fixtures(rows)
+            for name, drf, fast in self.get_suites(user):
+                self.run_suite(name, drf, fast, rows, repeat)
+            self.report_compression('payments csv', self.payments_csv(user))
+            transaction.set_rollback(True)
+
+    def create_fixtures(self, rows):
+        user = User.objects.create(username='benchmark-owner', email='owner@benchmark.invalid', role='pro')
+        assignee = User.objects.create(username='benchmark-assignee', email='assignee@benchmark.invalid')
+        tasks = Task.objects.bulk_create(
+            Task(owner=user, title=f'Task {i}', description='Lorem ipsum dolor sit amet. ' * 8) for i in range(rows)
+        )
+        MediaFile.objects.bulk_create(
+            MediaFile(task=task, file_url=f'https://cdn.example.com/{task.id}.png', file_type='image')
+            for task in tasks
+        )
+        TaskAssignment.objects.bulk_create(TaskAssignment(task=task, user=assignee) for task in tasks)
+        Notification.objects.bulk_create(Notification(user=user, message=f'Notification {i}') for i in range(rows))
+        PaymentTransaction.objects.bulk_create(
+            PaymentTransaction(user=user, amount='9.99', stripe_session_id=f'cs_{i}') for i in range(rows)
+        )
+        return user
+
+    def get_suites(self, user):
+        tasks = Task.objects.filter(owner=user).defer('search_vector')
+        notifications = Notification.objects.filter(user=user).order_by('-created_at')
+        payments = PaymentTransaction.objects.filter(user=user).order_by('-created_at')
+
+        def drf_tasks():
+            queryset = tasks.prefetch_related(
+                Prefetch('assignments', queryset=TaskAssignment.objects.select_related('user').order_by('id')),
+                Prefetch('media_files', queryset=MediaFile.objects.order_by('id')),
+            )
+            return TaskSerializer(queryset, many=True).data
+
+        def fast_tasks():
+            serializer = TaskValuesSerializer(TaskSerializer())
+            return serializer.to_representation(tasks.values(*serializer.columns))
+
+        def fast(serializer_class, queryset):
+            def run():
+                serializer = ValuesSerializer(serializer_class())
+                return serializer.to_representation(queryset.values(*serializer.columns))
+            return run
+
+        return [
+            ('tasks', drf_tasks, fast_tasks),
+            ('notifications', lambda: NotificationSerializer(notifications, many=True).data,
+             fast(NotificationSerializer, notifications)),
+            ('payments', lambda: PaymentTransactionSerializer(payments, many=True).data,
+             fast(PaymentTransactionSerializer, payments)),
+        ]
+
+    def run_suite(self, name, drf, fast, rows, repeat):
+        renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        data = drf()
+        content = renderer.render(data)
+        if content != renderer.render(fast()):
+            raise CommandError(f"{name}: fast path output differs from the DRF serializer")
+        if content != fast_renderer.render(data):
+            raise CommandError(f"{name}: FastJSONRenderer output differs from JSONRenderer")
+
+        self.report(f"{name} serialize", self.best_of(drf, repeat), self.best_of(fast, repeat), rows)
+        self.report(
+            f"{name} render",
+            self.best_of(lambda: renderer.render(data), repeat),
+            self.best_of(lambda: fast_renderer.render(data), repeat),
+            rows,
+        )
+        self.report_compression(f"{name} json", content)
+
+    def payments_csv(self, user):
+        columns = ['id', 'user_id', 'amount', 'currency', 'status', 'created_at']
+        rows = PaymentTransaction.objects.filter(user=user).values_list(*columns)
+        return ''.join(iter_csv(columns, rows)).encode()
+
+    def report_compression(self, name, content):
+        sizes = '   '.join(
+            f"{encoding} {len(compress(content, encoding)):>8} B "
+            f"(-{100 - len(compress(content, encoding)) * 100 / len(content):.0f}%)"
+            for encoding in ENCODINGS
+        )
+        self.stdout.write(f"{name:<24} raw {len(content):>8} B   {sizes}")
+
+    def report(self, name, baseline, optimized, rows):
+        self.stdout.write(
+            f"{name:<24} before {baseline / rows * 1e6:8.2f} us/row   "
+            f"after {optimized / rows * 1e6:8.2f} us/row   "
+            f"x{baseline / optimized:.1f}"
+        )
+
+    def best_of(self, func, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
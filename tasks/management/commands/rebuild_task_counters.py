@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from tasks.models import Task, TaskCounter
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-user task counters from the tasks table'
+
+    def handle(self, *args, **options):
+        counts = Task.objects.order_by().values('owner').annotate(task_count=Count('id'))
+        counters = [TaskCounter(user_id=row['owner'], task_count=row['task_count']) for row in counts]
+
+        with transaction.atomic():
+            TaskCounter.objects.bulk_create(
+                counters,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['task_count'],
+            )
+            # Users whose tasks were all deleted
+            reset = TaskCounter.objects.exclude(
+                user__in=Task.objects.values('owner')
+            ).exclude(task_count=0).update(task_count=0)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {len(counters)} task counters ({reset} reset to zero)"
+        ))
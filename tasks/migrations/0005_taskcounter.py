@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_user_options_remove_user_user_type_and_more'),
+        ('tasks', '0004_tasktombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('task_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+# Create or correct the counter of every user who owns tasks. From here on
+# TaskCounter.adjust() upserts the row, so it is never created from a COUNT(*)
+# that could miss a task inserted by a concurrent, uncommitted transaction.
+BACKFILL_SQL = """
+INSERT INTO tasks_taskcounter (user_id, task_count)
+SELECT owner_id, COUNT(*) FROM tasks_task GROUP BY owner_id
+ON CONFLICT (user_id) DO UPDATE SET task_count = EXCLUDED.task_count;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
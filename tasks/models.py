@@ -1,5 +1,31 @@
+from collections import defaultdict
+
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models
+from django.utils import timezone
+
+
+# Text search configuration used by the search_vector trigger and by search queries
+TASK_SEARCH_CONFIG = 'english'
+
+
+class TaskQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Tasks owned by or assigned to ``user``.
+
+        The visible IDs are the UNION of the owner index lookup and the user's
+        assignments, so the planner starts from the user's own small set of tasks
+        (for the page and its COUNT(*) alike) instead of filtering every task with
+        ``owner = ... OR EXISTS (...)``, which no index can answer. UNION removes
+        duplicates, so no DISTINCT is needed. The assignment check is also exposed as
+        ``is_assignee`` so object permissions and ``?scope=assigned`` need no extra query.
+        """
+        owned = Task.objects.filter(owner=user).order_by().values('id')
+        assigned = TaskAssignment.objects.filter(user=user).order_by().values('task_id')
+        is_assignee = models.Exists(TaskAssignment.objects.filter(task=models.OuterRef('pk'), user=user))
+        return self.annotate(is_assignee=is_assignee).filter(id__in=owned.union(assigned))
 
 
 class Task(models.Model):
@@ -21,18 +47,32 @@ class Task(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='tasks', db_index=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Weighted title (A) + description (B) vector, maintained by a database trigger
+    # (see migration 0006) so bulk writes keep it current as well
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['owner', 'status']),
             models.Index(fields=['owner', 'due_date']),
-            models.Index(fields=['-created_at']),
+            models.Index(fields=['owner', 'priority']),
+            models.Index(fields=['owner', 'updated_at']),
+            models.Index(fields=['owner', '-created_at', '-id']),
+            models.Index(fields=['-created_at', '-id']),
+            GinIndex(fields=['search_vector']),
         ]
 
     def __str__(self):
         return f"{self.title}"
 
+    def touch(self):
+        """Bump ``updated_at`` after a change to a related row (assignment, media)."""
+        self.updated_at = timezone.now()
+        Task.objects.filter(pk=self.pk).update(updated_at=self.updated_at)
+
 
 class TaskAssignment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='assignments')
@@ -48,3 +88,87 @@ class MediaFile(models.Model):
     file_url = models.URLField()
     file_type = models.CharField(max_length=50, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+
+
+class TaskTombstone(models.Model):
+    """Deletion log used by the sync endpoint to tell clients a task left their visible set"""
+    class Reason(models.TextChoices):
+        DELETED = 'deleted', 'Deleted'
+        UNASSIGNED = 'unassigned', 'Unassigned'
+
+    task_id = models.BigIntegerField()
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='task_tombstones')
+    reason = models.CharField(max_length=20, choices=Reason.choices)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-deleted_at']
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+
+    @classmethod
+    def record_deletion(cls, tasks):
+        """
+        Log a tombstone for the owner and every assignee of each task about to be deleted
+
+        Returns:
+            dict: ID of each user the tasks were visible to -> IDs of those tasks
+        """
+        task_ids = [task.id for task in tasks]
+        recipients = {(task.id, task.owner_id) for task in tasks}
+        recipients.update(TaskAssignment.objects.filter(task_id__in=task_ids).values_list('task_id', 'user_id'))
+        cls.objects.bulk_create([
+            cls(task_id=task_id, user_id=user_id, reason=cls.Reason.DELETED)
+            for task_id, user_id in recipients
+        ])
+        affected = defaultdict(set)
+        for task_id, user_id in recipients:
+            affected[user_id].add(task_id)
+        return affected
+
+
+class TaskCounter(models.Model):
+    """
+    Per-user count of owned tasks, kept in step with task creates and deletes
+
+    Rows were backfilled by migration 0008 and are upserted by ``adjust``, so a
+    user without a row owns no tasks.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='task_counter'
+    )
+    task_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.task_count} tasks"
+
+    @classmethod
+    def lock_for_user(cls, user):
+        """
+        Return the user's counter row locked with SELECT ... FOR UPDATE.
+
+        Must be called inside a transaction. A missing row is created at zero.
+        """
+        cls.objects.bulk_create([cls(user=user)], ignore_conflicts=True)
+        return cls.objects.select_for_update().get(user=user)
+
+    @classmethod
+    def get_count(cls, user):
+        return cls.objects.filter(user=user).values_list('task_count', flat=True).first() or 0
+
+    @classmethod
+    def adjust(cls, user_id, delta):
+        """
+        Atomically add ``delta`` to the counter, creating the row if the user has none
+
+        A single upsert, so a change made while another transaction creates the row
+        waits for that row instead of updating nothing.
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (user_id, task_count) VALUES (%s, GREATEST(%s, 0)) "
+                f"ON CONFLICT (user_id) DO UPDATE SET task_count = GREATEST({table}.task_count + %s, 0)",
+                [user_id, delta, delta],
+            )
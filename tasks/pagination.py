@@ -0,0 +1,24 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TaskCursorPagination(CursorPagination):
+    """Keyset pagination over (created_at, id) for infinite-scroll clients.
+
+    Pages are located by the position of the last row seen instead of an OFFSET, so
+    deep pages cost the same as the first one, no COUNT(*) is issued, and tasks
+    created while a client is scrolling never shift rows between pages.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class UserDirectoryPagination(CursorPagination):
+    """Keyset pagination for the assignee directory, ordered by the unique username"""
+    ordering = ('username',)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        # The directory is paginated inside TaskViewSet, whose ordering filter takes task fields
+        return self.ordering
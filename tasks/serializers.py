@@ -1,5 +1,7 @@
+from collections import defaultdict
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from task_mangement_api.serialization import ValuesSerializer
 from .models import Task, TaskAssignment, MediaFile
 
 User = get_user_model()
@@ -24,6 +26,9 @@ class TaskSerializer(serializers.ModelSerializer):
     media_files = MediaFileSerializer(many=True, read_only=True)
     assigned_users = serializers.SerializerMethodField()
 
+    # Nested fields that can be requested with ?expand=
+    expandable_fields = ('media_files', 'assigned_users')
+
     class Meta:
         model = Task
         fields = (
@@ -32,12 +37,54 @@ class TaskSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ('id', 'owner', 'created_at', 'updated_at', 'assigned_users')
 
+    def __init__(self, *args, fields=None, **kwargs):
+        """``fields`` limits the output to the given field names (sparse fieldsets)"""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     def get_assigned_users(self, obj):
         """Get list of users assigned to this task"""
-        assignments = TaskAssignment.objects.filter(task=obj).select_related('user')
+        assignments = obj.assignments.all()
+        # Fall back to a joined query when TaskViewSet.get_queryset did not prefetch (e.g. after create/update)
+        if 'assignments' not in getattr(obj, '_prefetched_objects_cache', {}):
+            assignments = assignments.select_related('user').order_by('id')
         return AssignedUserSerializer([a.user for a in assignments], many=True).data
 
     def create(self, validated_data):
         request = self.context['request']
         validated_data['owner'] = request.user
         return super().create(validated_data)
+
+
+class TaskSearchResultSerializer(TaskSerializer):
+    """Task search hit with its relevance and highlighted snippets"""
+    search_rank = serializers.FloatField(read_only=True)
+    title_highlight = serializers.CharField(read_only=True)
+    description_highlight = serializers.CharField(read_only=True)
+
+    class Meta(TaskSerializer.Meta):
+        fields = TaskSerializer.Meta.fields + ('search_rank', 'title_highlight', 'description_highlight')
+
+
+class TaskValuesSerializer(ValuesSerializer):
+    """Read-only TaskSerializer output built from ``.values()`` rows"""
+
+    def get_media_files_map(self, task_ids):
+        media = ValuesSerializer(MediaFileSerializer())
+        rows = list(MediaFile.objects.filter(task_id__in=task_ids).order_by('id').values('task_id', *media.columns))
+        media_files = defaultdict(list)
+        for row, item in zip(rows, media.to_representation(rows)):
+            media_files[row['task_id']].append(item)
+        return media_files
+
+    def get_assigned_users_map(self, task_ids):
+        users = ValuesSerializer(AssignedUserSerializer(), prefix='user__')
+        rows = list(
+            TaskAssignment.objects.filter(task_id__in=task_ids).order_by('id').values('task_id', *users.columns)
+        )
+        assigned_users = defaultdict(list)
+        for row, item in zip(rows, users.to_representation(rows)):
+            assigned_users[row['task_id']].append(item)
+        return assigned_users
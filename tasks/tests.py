@@ -0,0 +1,746 @@
+import datetime
+import re
+import time
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .models import MediaFile, Task, TaskAssignment, TaskCounter, TaskTombstone
+from .serializers import TaskSerializer, TaskValuesSerializer
+from .views import BASIC_USER_TASK_LIMIT, BULK_MAX_ITEMS
+
+User = get_user_model()
+
+
+class TaskAPITestCase(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw', role='pro', is_verified=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def create_tasks(self, count, assignees=1):
+        """Tasks owned by ``self.owner``, each with one media file and ``assignees`` assigned users"""
+        tasks = []
+        for i in range(count):
+            task = Task.objects.create(title=f'Task {i}', description='Details', owner=self.owner)
+            MediaFile.objects.create(task=task, file_url=f'https://example.com/{i}.png', file_type='image')
+            for j in range(assignees):
+                user, _ = User.objects.get_or_create(username=f'assignee{j}', defaults={'email': f'a{j}@example.com'})
+                TaskAssignment.objects.create(task=task, user=user)
+            tasks.append(task)
+        return tasks
+
+
+class TaskQueryCountTests(TaskAPITestCase):
+    """A page of tasks costs the same number of queries however many tasks and assignees it holds"""
+
+    def assert_constant_queries(self, url, num_queries):
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list(self):
+        self.create_tasks(2)
+        # Count, page, media files, assignments
+        self.assert_constant_queries('/api/v1/tasks/', 4)
+        self.create_tasks(15, assignees=3)
+        response = self.assert_constant_queries('/api/v1/tasks/', 4)
+        self.assertEqual(len(response.json()['results']), 17)
+        self.assertEqual(len(response.json()['results'][0]['assigned_users']), 3)
+
+    def test_cursor_list(self):
+        self.create_tasks(2)
+        self.assert_constant_queries('/api/v1/tasks/?pagination=cursor', 3)
+        self.create_tasks(15, assignees=3)
+        self.assert_constant_queries('/api/v1/tasks/?pagination=cursor', 3)
+
+    def test_detail(self):
+        task = self.create_tasks(1)[0]
+        # Task with permission check, media files, assignments
+        self.assert_constant_queries(f'/api/v1/tasks/{task.id}/', 3)
+        for i in range(5):
+            user = User.objects.create_user(f'extra{i}', f'extra{i}@example.com', 'pw')
+            TaskAssignment.objects.create(task=task, user=user)
+            MediaFile.objects.create(task=task, file_url=f'https://example.com/extra{i}.png', file_type='image')
+        response = self.assert_constant_queries(f'/api/v1/tasks/{task.id}/', 3)
+        self.assertEqual(len(response.json()['assigned_users']), 6)
+
+
+class TaskConditionalGetTests(TaskAPITestCase):
+    def test_list_etag_follows_the_served_page(self):
+        tasks = self.create_tasks(3)
+        url = '/api/v1/tasks/?pagination=cursor&page_size=2'
+        etag = self.client.get(url)['ETag']
+
+        # Only the page is read: no nested queries for a 304
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # A write to a task outside the page leaves the page's ETag alone
+        tasks[0].touch()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # A write to a task on the page changes it
+        tasks[2].touch()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_etag_changes_with_the_page_set(self):
+        tasks = self.create_tasks(3)
+        etag = self.client.get('/api/v1/tasks/')['ETag']
+        self.assertNotEqual(self.client.get('/api/v1/tasks/?status=todo')['ETag'], etag)
+        tasks[0].delete()
+        self.assertEqual(self.client.get('/api/v1/tasks/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detail_etag(self):
+        task = self.create_tasks(1)[0]
+        etag = self.client.get(f'/api/v1/tasks/{task.id}/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/v1/tasks/{task.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class TaskFilterTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        self.owned = Task.objects.create(title='Owned', owner=self.owner)
+        self.assigned = Task.objects.create(title='Assigned', owner=self.other)
+        TaskAssignment.objects.create(task=self.assigned, user=self.owner)
+        # Owned and assigned at once, and a task the caller cannot see
+        self.both = Task.objects.create(title='Both', owner=self.owner)
+        TaskAssignment.objects.create(task=self.both, user=self.owner)
+        Task.objects.create(title='Hidden', owner=self.other)
+
+    def list_ids(self, params=''):
+        response = self.client.get(f'/api/v1/tasks/?{params}')
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.json()['results']]
+
+    def test_scopes(self):
+        self.assertEqual(self.list_ids(), [self.both.id, self.assigned.id, self.owned.id])
+        self.assertEqual(self.client.get('/api/v1/tasks/').json()['count'], 3)
+        self.assertEqual(self.list_ids('scope=owned'), [self.both.id, self.owned.id])
+        self.assertEqual(self.list_ids('scope=assigned'), [self.both.id, self.assigned.id])
+        self.assertEqual(self.client.get('/api/v1/tasks/?scope=mine').status_code, 400)
+
+    def test_overdue(self):
+        today = timezone.localdate()
+        Task.objects.filter(pk=self.owned.pk).update(due_date=today - datetime.timedelta(days=1))
+        Task.objects.filter(pk=self.assigned.pk).update(
+            due_date=today - datetime.timedelta(days=1), status=Task.Status.DONE
+        )
+        Task.objects.filter(pk=self.both.pk).update(due_date=today)
+
+        self.assertEqual(self.list_ids('overdue=true'), [self.owned.id])
+        self.assertEqual(self.list_ids('overdue=false'), [self.both.id, self.assigned.id])
+        self.assertEqual(self.list_ids('overdue=true&scope=assigned'), [])
+        self.assertEqual(self.client.get('/api/v1/tasks/?overdue=sometimes').status_code, 400)
+
+
+class TaskSearchTests(TaskAPITestCase):
+    def test_search(self):
+        tasks = self.create_tasks(2, assignees=0)
+        Task.objects.filter(pk=tasks[0].pk).update(title='Quarterly report')
+        results = self.client.get('/api/v1/tasks/?q=quarterly').json()['results']
+        self.assertEqual([item['id'] for item in results], [tasks[0].id])
+        self.assertEqual(results[0]['title_highlight'], '<mark>Quarterly</mark> report')
+
+    def test_detail_actions_ignore_the_search(self):
+        task = self.create_tasks(1)[0]
+        # Same queries as without ?q=: no filtering, ranking or highlighting
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/v1/tasks/{task.id}/?q=unrelated')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('search_rank', response.json())
+        response = self.client.patch(f'/api/v1/tasks/{task.id}/?q=unrelated', {'title': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(f'/api/v1/tasks/{task.id}/media/?q=unrelated').status_code, 200)
+
+
+class UserDirectoryTests(TaskAPITestCase):
+    def test_task_ordering_does_not_apply(self):
+        for i in range(3):
+            User.objects.create_user(f'user{i}', f'user{i}@example.com', 'pw', is_verified=True)
+        for ordering in ('title', '-due_date', 'created_at', 'updated_at'):
+            response = self.client.get(f'/api/v1/tasks/users/?ordering={ordering}&page_size=2')
+            self.assertEqual(response.status_code, 200, ordering)
+            self.assertEqual([user['username'] for user in response.json()['results']], ['user0', 'user1'])
+            next_page = self.client.get(response.json()['next']).json()['results']
+            self.assertEqual([user['username'] for user in next_page], ['user2'])
+
+
+class TaskSparseFieldsetTests(TaskAPITestCase):
+    def test_fields_and_expand(self):
+        self.create_tasks(1)
+        response = self.client.get('/api/v1/tasks/?fields=id,title&expand=media_files')
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'title', 'media_files'})
+
+    def test_expand_alone_returns_the_full_representation(self):
+        task = self.create_tasks(1)[0]
+        response = self.client.get(f'/api/v1/tasks/{task.id}/?expand=assigned_users')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.client.get(f'/api/v1/tasks/{task.id}/').json())
+
+    def test_unknown_names_are_rejected(self):
+        task = self.create_tasks(1)[0]
+        for url in ('/api/v1/tasks/', f'/api/v1/tasks/{task.id}/'):
+            self.assertEqual(self.client.get(f'{url}?fields=bogus').status_code, 400)
+            self.assertEqual(self.client.get(f'{url}?expand=bogus').status_code, 400)
+            self.assertEqual(self.client.get(f'{url}?fields=id&expand=title').status_code, 400)
+
+
+class TaskValuesSerializerTests(TaskAPITestCase):
+    """The .values() fast path renders exactly what TaskSerializer renders"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_tasks(2, assignees=2)
+        Task.objects.create(
+            title='Bare', owner=self.owner, due_date=datetime.date(2026, 3, 1),
+            priority=Task.Priority.HIGH, status=Task.Status.DONE,
+        )
+
+    def assert_equivalent(self, fields=None):
+        tasks = Task.objects.order_by('-created_at', '-id')
+        expected = TaskSerializer(
+            tasks.prefetch_related('assignments__user', 'media_files'), many=True, fields=fields
+        ).data
+        serializer = TaskValuesSerializer(TaskSerializer(fields=fields))
+        actual = serializer.to_representation(tasks.values(*serializer.columns))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_full_representation(self):
+        self.assert_equivalent()
+
+    def test_sparse_fieldsets(self):
+        self.assert_equivalent({'id', 'title'})
+        self.assert_equivalent({'due_date', 'priority', 'status', 'owner', 'media_files'})
+        self.assert_equivalent({'description', 'assigned_users', 'updated_at'})
+
+    def test_list_matches_detail(self):
+        for params in ('', 'fields=id,title,due_date&expand=assigned_users', 'expand=media_files'):
+            results = self.client.get(f'/api/v1/tasks/?{params}').json()['results']
+            self.assertEqual(len(results), 3)
+            for item in results:
+                self.assertEqual(item, self.client.get(f"/api/v1/tasks/{item['id']}/?{params}").json())
+
+
+class TaskListFieldsTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_tasks(3)
+
+    def test_cursor_pagination_with_fields(self):
+        # The cursor's ordering key is read from the rows even when it is not a requested field
+        url = '/api/v1/tasks/?pagination=cursor&page_size=2&fields=title'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([set(item) for item in response.json()['results']], [{'title'}] * 2)
+        response = self.client.get(response.json()['next'])
+        self.assertEqual([item['title'] for item in response.json()['results']], ['Task 0'])
+
+
+class TaskSyncTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.assignee = User.objects.create_user('assignee', 'assignee@example.com', 'pw')
+        self.assignee_client = APIClient()
+        self.assignee_client.force_authenticate(self.assignee)
+        self.tasks = self.create_tasks(4, assignees=0)
+        for task in self.tasks:
+            TaskAssignment.objects.create(task=task, user=self.assignee)
+        # Written well before the first sync, outside the overlap window
+        Task.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+
+    def sync(self, token=None, client=None):
+        response = (client or self.client).get('/api/v1/tasks/sync/', {'since': token} if token else {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def sync_all(self, token=None, client=None):
+        """Follow has_more to the end of a round; returns the changed IDs of each page and the last response"""
+        pages = []
+        while True:
+            data = self.sync(token, client)
+            pages.append([item['id'] for item in data['changed']])
+            token = data['token']
+            if not data['has_more']:
+                return pages, data
+
+    def test_round_trip(self):
+        data = self.sync()
+        self.assertEqual(sorted(item['id'] for item in data['changed']), sorted(task.id for task in self.tasks))
+        self.assertEqual((data['deleted'], data['has_more']), ([], False))
+
+        data = self.sync(data['token'])
+        self.assertEqual((data['changed'], data['deleted']), ([], []))
+
+        self.client.patch(f'/api/v1/tasks/{self.tasks[1].id}/', {'title': 'Renamed'}, format='json')
+        data = self.sync(data['token'], self.assignee_client)
+        self.assertEqual([(item['id'], item['title']) for item in data['changed']], [(self.tasks[1].id, 'Renamed')])
+
+    def test_pages_across_equal_updated_at(self):
+        # Six tasks share one updated_at: pages are keyed on (updated_at, id) so none is skipped or repeated
+        self.create_tasks(2, assignees=0)
+        Task.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+        ids = sorted(Task.objects.values_list('id', flat=True))
+        with mock.patch('tasks.views.SYNC_PAGE_SIZE', 4):
+            pages, data = self.sync_all()
+        self.assertEqual(pages, [ids[:4], ids[4:]])
+
+        with mock.patch('tasks.views.SYNC_PAGE_SIZE', 4):
+            Task.objects.filter(id__in=ids[:5]).update(updated_at=timezone.now())
+            pages, _ = self.sync_all(data['token'])
+        self.assertEqual(pages, [ids[:4], ids[4:5]])
+
+    def test_tombstones(self):
+        token = self.sync(client=self.assignee_client)['token']
+        owner_token = self.sync()['token']
+        deleted, bulk_deleted, unassigned, kept = self.tasks
+
+        self.client.delete(f'/api/v1/tasks/{deleted.id}/')
+        self.client.delete('/api/v1/tasks/bulk/', {'ids': [bulk_deleted.id]}, format='json')
+        self.client.delete(f'/api/v1/tasks/{unassigned.id}/unassign/', {'user_id': self.assignee.id}, format='json')
+
+        data = self.sync(token, self.assignee_client)
+        self.assertEqual(sorted((item['id'], item['reason']) for item in data['deleted']), [
+            (deleted.id, 'deleted'), (bulk_deleted.id, 'deleted'), (unassigned.id, 'unassigned'),
+        ])
+        self.assertEqual(data['changed'], [])
+
+        # The owner still sees the unassigned task, as a change rather than a tombstone
+        data = self.sync(owner_token)
+        self.assertEqual(
+            sorted((item['id'], item['reason']) for item in data['deleted']),
+            [(deleted.id, 'deleted'), (bulk_deleted.id, 'deleted')],
+        )
+        self.assertEqual([item['id'] for item in data['changed']], [unassigned.id])
+
+        # A task assigned again is visible, so its old tombstone is not sent
+        self.client.post(f'/api/v1/tasks/{unassigned.id}/assign/', {'user_id': self.assignee.id}, format='json')
+        data = self.sync(token, self.assignee_client)
+        self.assertNotIn(unassigned.id, [item['id'] for item in data['deleted']])
+        self.assertIn(unassigned.id, [item['id'] for item in data['changed']])
+        self.assertNotIn(kept.id, [item['id'] for item in data['changed']])
+
+    def test_tombstones_are_sent_on_the_first_page_of_a_round(self):
+        token = self.sync()['token']
+        self.client.delete(f'/api/v1/tasks/{self.tasks[0].id}/')
+        Task.objects.update(updated_at=timezone.now())
+        with mock.patch('tasks.views.SYNC_PAGE_SIZE', 2):
+            first = self.sync(token)
+            second = self.sync(first['token'])
+        self.assertEqual([item['id'] for item in first['deleted']], [self.tasks[0].id])
+        self.assertTrue(first['has_more'])
+        self.assertEqual(second['deleted'], [])
+
+    def test_rejected_tokens(self):
+        token = self.sync()['token']
+        for bad in ('garbage', token[:-2], signing.dumps({'since': None}), signing.dumps('x', salt='tasks.sync')):
+            response = self.client.get('/api/v1/tasks/sync/', {'since': bad})
+            self.assertEqual(response.status_code, 400, bad)
+            self.assertEqual(response.json()['detail'], 'Invalid sync token')
+
+        with mock.patch('time.time', return_value=time.time() + datetime.timedelta(days=31).total_seconds()):
+            response = self.client.get('/api/v1/tasks/sync/', {'since': token})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['detail'], 'Sync token has expired')
+
+
+class TaskCounterTests(TaskAPITestCase):
+    def assert_counted(self, user):
+        self.assertEqual(TaskCounter.get_count(user), Task.objects.filter(owner=user).count())
+
+    def test_adjust_creates_a_missing_row(self):
+        other = User.objects.create_user('other', 'other@example.com', 'pw')
+        self.assertFalse(TaskCounter.objects.filter(user=self.owner).exists())
+        self.assertEqual(TaskCounter.get_count(self.owner), 0)
+
+        TaskCounter.adjust(self.owner.id, 3)
+        self.assertEqual(TaskCounter.objects.get(user=self.owner).task_count, 3)
+        TaskCounter.adjust(self.owner.id, -5)
+        self.assertEqual(TaskCounter.objects.get(user=self.owner).task_count, 0)
+        TaskCounter.adjust(other.id, -1)
+        self.assertEqual(TaskCounter.objects.get(user=other).task_count, 0)
+
+    def test_lock_for_user_creates_a_missing_row_at_zero(self):
+        with transaction.atomic():
+            self.assertEqual(TaskCounter.lock_for_user(self.owner).task_count, 0)
+        self.assertTrue(TaskCounter.objects.filter(user=self.owner).exists())
+
+    def test_counter_tracks_writes(self):
+        task_id = self.client.post('/api/v1/tasks/', {'title': 'One'}, format='json').json()['id']
+        self.assert_counted(self.owner)
+        response = self.client.post('/api/v1/tasks/bulk/', [{'title': f'Bulk {i}'} for i in range(3)], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assert_counted(self.owner)
+        self.assertEqual(TaskCounter.get_count(self.owner), 4)
+
+        self.client.delete(f'/api/v1/tasks/{task_id}/')
+        self.assert_counted(self.owner)
+        ids = [item['id'] for item in response.json()[:2]]
+        self.client.delete('/api/v1/tasks/bulk/', {'ids': ids}, format='json')
+        self.assert_counted(self.owner)
+        self.assertEqual(self.client.get('/api/v1/tasks/count/').json()['current_count'], 1)
+
+    def test_basic_user_quota(self):
+        basic = User.objects.create_user('basic', 'basic@example.com', 'pw', is_verified=True)
+        self.client.force_authenticate(basic)
+        for i in range(BASIC_USER_TASK_LIMIT - 1):
+            self.assertEqual(self.client.post('/api/v1/tasks/', {'title': f'Task {i}'}, format='json').status_code, 201)
+
+        # A bulk create that would cross the limit is refused as a whole
+        response = self.client.post('/api/v1/tasks/bulk/', [{'title': 'A'}, {'title': 'B'}], format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.post('/api/v1/tasks/', {'title': 'Last'}, format='json').status_code, 201)
+        self.assertEqual(self.client.post('/api/v1/tasks/', {'title': 'Over'}, format='json').status_code, 403)
+        self.assert_counted(basic)
+        self.assertEqual(self.client.get('/api/v1/tasks/count/').json()['remaining'], 0)
+
+        # Deleting frees a slot
+        self.client.delete(f'/api/v1/tasks/{Task.objects.filter(owner=basic).first().id}/')
+        self.assertEqual(self.client.post('/api/v1/tasks/', {'title': 'Again'}, format='json').status_code, 201)
+        self.assert_counted(basic)
+
+
+class TaskBulkTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user('other', 'other@example.com', 'pw', role='pro')
+        self.mine = self.create_tasks(2, assignees=1)
+        self.theirs = Task.objects.create(title='Theirs', owner=self.other)
+        # Visible to the caller as an assignee
+        self.shared = Task.objects.create(title='Shared', owner=self.other)
+        TaskAssignment.objects.create(task=self.shared, user=self.owner)
+        TaskCounter.adjust(self.owner.id, 2)
+        TaskCounter.adjust(self.other.id, 2)
+
+    def test_rejected_payloads(self):
+        for method in ('post', 'patch'):
+            request = getattr(self.client, method)
+            for payload in ({'title': 'Not a list'}, [], [{'title': 'x'}] * (BULK_MAX_ITEMS + 1)):
+                self.assertEqual(request('/api/v1/tasks/bulk/', payload, format='json').status_code, 400)
+        self.assertEqual(self.client.patch('/api/v1/tasks/bulk/', [1, 2], format='json').status_code, 400)
+        self.assertEqual(self.client.patch('/api/v1/tasks/bulk/', [{'id': 'x'}], format='json').status_code, 400)
+        for payload in ([1, 2], {'ids': 'x'}, {'ids': []}, {'ids': list(range(BULK_MAX_ITEMS + 1))}, {'ids': ['a']}):
+            self.assertEqual(self.client.delete('/api/v1/tasks/bulk/', payload, format='json').status_code, 400)
+        self.assertEqual(Task.objects.count(), 4)
+
+    def test_create(self):
+        response = self.client.post(
+            '/api/v1/tasks/bulk/', [{'title': 'A', 'priority': 'high'}, {'title': 'B'}], format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([(item['title'], item['owner']) for item in response.json()], [
+            ('A', self.owner.id), ('B', self.owner.id),
+        ])
+        self.assertEqual(TaskCounter.get_count(self.owner), 4)
+
+        # One invalid item rejects the whole batch
+        response = self.client.post('/api/v1/tasks/bulk/', [{'title': 'C'}, {'priority': 'urgent'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.filter(title='C').exists())
+        self.assertEqual(TaskCounter.get_count(self.owner), 4)
+
+    def test_update(self):
+        before = Task.objects.get(pk=self.mine[0].pk).updated_at
+        response = self.client.patch('/api/v1/tasks/bulk/', [
+            {'id': self.mine[0].id, 'status': 'done'},
+            {'id': self.shared.id, 'title': 'Renamed'},
+            {'id': self.theirs.id, 'status': 'done'},
+            {'id': self.mine[1].id, 'priority': 'urgent'},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['status'] for item in response.json()], ['updated', 'updated', 'not_found', 'invalid'])
+        self.assertIn('priority', response.json()[3]['errors'])
+
+        self.assertEqual(Task.objects.get(pk=self.mine[0].pk).status, 'done')
+        self.assertGreater(Task.objects.get(pk=self.mine[0].pk).updated_at, before)
+        self.assertEqual(Task.objects.get(pk=self.shared.pk).title, 'Renamed')
+        self.assertEqual(Task.objects.get(pk=self.theirs.pk).status, 'todo')
+        self.assertEqual(Task.objects.get(pk=self.mine[1].pk).priority, 'medium')
+
+    def test_delete(self):
+        assignee = self.mine[0].assignments.get().user
+        ids = [self.mine[0].id, self.theirs.id, self.shared.id, 0]
+        response = self.client.delete('/api/v1/tasks/bulk/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item['status'] for item in response.json()], ['deleted', 'not_found', 'deleted', 'not_found']
+        )
+        self.assertEqual(
+            sorted(Task.objects.values_list('id', flat=True)), sorted([self.mine[1].id, self.theirs.id])
+        )
+
+        # Each owner's counter drops by their own deleted tasks
+        self.assertEqual(TaskCounter.get_count(self.owner), 1)
+        self.assertEqual(TaskCounter.get_count(self.other), 1)
+        # Everyone who could see a deleted task gets a tombstone
+        self.assertEqual(sorted(TaskTombstone.objects.values_list('task_id', 'user_id')), sorted([
+            (self.mine[0].id, self.owner.id), (self.mine[0].id, assignee.id),
+            (self.shared.id, self.other.id), (self.shared.id, self.owner.id),
+        ]))
+
+
+class TaskSummaryTests(TaskAPITestCase):
+    """The cached summary always matches a fresh count once a write commits"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        today = timezone.localdate()
+        self.assignee = User.objects.create_user('assignee', 'assignee@example.com', 'pw', role='pro')
+        self.assignee_client = APIClient()
+        self.assignee_client.force_authenticate(self.assignee)
+        self.tasks = [
+            Task.objects.create(title='Overdue', owner=self.owner, due_date=today - datetime.timedelta(days=1)),
+            Task.objects.create(title='Due today', owner=self.owner, due_date=today, priority='high'),
+            Task.objects.create(title='Later', owner=self.owner, due_date=today + datetime.timedelta(days=3)),
+            Task.objects.create(title='Finished', owner=self.owner, due_date=today, status='done', priority='low'),
+        ]
+        for task in self.tasks[:2]:
+            TaskAssignment.objects.create(task=task, user=self.assignee)
+        TaskCounter.adjust(self.owner.id, len(self.tasks))
+
+    def fresh_summary(self, user):
+        today = timezone.localdate()
+        data = {}
+        for group, tasks in (
+            ('owned', Task.objects.filter(owner=user)),
+            ('assigned', Task.objects.filter(assignments__user=user)),
+        ):
+            tasks = list(tasks)
+            unfinished = [task for task in tasks if task.status != Task.Status.DONE]
+            data[group] = {
+                'total': len(tasks),
+                'overdue': sum(task.due_date is not None and task.due_date < today for task in unfinished),
+                'due_today': sum(task.due_date == today for task in unfinished),
+                'by_status': {value: sum(task.status == value for task in tasks) for value in Task.Status.values},
+                'by_priority': {value: sum(task.priority == value for task in tasks) for value in Task.Priority.values},
+            }
+        return data
+
+    def assert_summaries(self):
+        for user, client in ((self.owner, self.client), (self.assignee, self.assignee_client)):
+            self.assertEqual(client.get('/api/v1/tasks/summary/').json(), self.fresh_summary(user), user)
+
+    def write(self, method, url, data=None):
+        # Populate both caches first, so a write that misses an invalidation serves a stale summary
+        self.assert_summaries()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertLess(response.status_code, 300, response.content)
+        self.assert_summaries()
+        return response
+
+    def test_summary_is_cached(self):
+        self.assert_summaries()
+        with self.assertNumQueries(0):
+            self.client.get('/api/v1/tasks/summary/')
+        self.assertEqual(self.fresh_summary(self.assignee)['assigned']['overdue'], 1)
+
+    def test_status_changes(self):
+        self.write('patch', f'/api/v1/tasks/{self.tasks[0].id}/', {'status': 'done'})
+        self.write('patch', f'/api/v1/tasks/{self.tasks[3].id}/', {'status': 'in_progress', 'priority': 'high'})
+        self.write('patch', f'/api/v1/tasks/{self.tasks[1].id}/', {'due_date': None})
+        self.assertEqual(self.fresh_summary(self.assignee)['assigned']['by_status']['done'], 1)
+
+    def test_delete(self):
+        self.write('delete', f'/api/v1/tasks/{self.tasks[0].id}/')
+        self.assertEqual(self.fresh_summary(self.assignee)['assigned']['total'], 1)
+
+    def test_assignment_changes(self):
+        self.write('post', f'/api/v1/tasks/{self.tasks[2].id}/assign/', {'user_id': self.assignee.id})
+        self.write('delete', f'/api/v1/tasks/{self.tasks[0].id}/unassign/', {'user_id': self.assignee.id})
+        self.write('post', f'/api/v1/tasks/{self.tasks[3].id}/assign-bulk/', {'user_ids': [self.assignee.id]})
+        self.assertEqual(self.fresh_summary(self.assignee)['assigned']['total'], 3)
+
+    def test_bulk_operations(self):
+        self.write('post', '/api/v1/tasks/bulk/', [
+            {'title': 'Bulk overdue', 'due_date': str(timezone.localdate() - datetime.timedelta(days=2))},
+            {'title': 'Bulk low', 'priority': 'low'},
+        ])
+        self.write('patch', '/api/v1/tasks/bulk/', [
+            {'id': self.tasks[0].id, 'status': 'done'},
+            {'id': self.tasks[1].id, 'priority': 'low'},
+        ])
+        self.write('delete', '/api/v1/tasks/bulk/', {'ids': [self.tasks[1].id, self.tasks[3].id]})
+        self.assertEqual(self.fresh_summary(self.assignee)['assigned']['total'], 1)
+
+
+class TaskAssignBulkTests(TaskAPITestCase):
+    def test_rejected_payloads(self):
+        task = self.create_tasks(1, assignees=0)[0]
+        url = f'/api/v1/tasks/{task.id}/assign-bulk/'
+        for payload in ([1, 2], {'user_ids': 1}, {'user_ids': []}, {'user_ids': ['a']}, {}):
+            self.assertEqual(self.client.post(url, payload, format='json').status_code, 400, payload)
+        self.assertFalse(TaskAssignment.objects.exists())
+
+    def test_concurrently_assigned_users_are_not_notified_twice(self):
+        from notifications.models import Notification
+
+        task = self.create_tasks(1, assignees=0)[0]
+        users = [User.objects.create_user(f'user{i}', f'user{i}@example.com', 'pw').id for i in range(3)]
+        bulk_create = TaskAssignment.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # Another request assigns users[1] between the pre-read and the insert
+            TaskAssignment.objects.create(task=task, user_id=users[1])
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(TaskAssignment.objects, 'bulk_create', racing_bulk_create):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(f'/api/v1/tasks/{task.id}/assign-bulk/', {'user_ids': users}, format='json')
+
+        self.assertEqual(response.json()['assigned'], [users[0], users[2]])
+        self.assertEqual(response.json()['already_assigned'], [users[1]])
+        self.assertEqual(
+            sorted(Notification.objects.values_list('user_id', flat=True)), [users[0], users[2]]
+        )
+
+
+class TaskAssignmentPushTests(TaskAPITestCase):
+    """Assignment pushes are written to the outbox in the assignment's transaction"""
+
+    def setUp(self):
+        super().setUp()
+        self.task = self.create_tasks(1, assignees=0)[0]
+        self.users = [User.objects.create_user(f'user{i}', f'user{i}@example.com', 'pw').id for i in range(3)]
+        patcher = mock.patch('notifications.fcm_utils.FIREBASE_AVAILABLE', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def queued_pushes(self):
+        from notifications.models import PushOutbox
+
+        return sorted(PushOutbox.objects.values_list('user_id', 'data__task_id'))
+
+    def test_assign(self):
+        # No on-commit callback runs: the row comes from the request's own transaction
+        with self.captureOnCommitCallbacks(execute=False):
+            self.client.post(f'/api/v1/tasks/{self.task.id}/assign/', {'user_id': self.users[0]}, format='json')
+            self.client.post(f'/api/v1/tasks/{self.task.id}/assign/', {'user_id': self.users[0]}, format='json')
+        self.assertEqual(self.queued_pushes(), [(self.users[0], str(self.task.id))])
+
+    def test_assign_bulk(self):
+        TaskAssignment.objects.create(task=self.task, user_id=self.users[1])
+        with self.captureOnCommitCallbacks(execute=False):
+            self.client.post(f'/api/v1/tasks/{self.task.id}/assign-bulk/', {'user_ids': self.users}, format='json')
+        self.assertEqual(
+            self.queued_pushes(), [(self.users[0], str(self.task.id)), (self.users[2], str(self.task.id))]
+        )
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Query plans are checked on PostgreSQL')
+class TaskQueryPlanTests(TaskAPITestCase):
+    """
+    The list filters, scopes and search are served by the indexes declared on Task.
+
+    Plans are taken over a table where the caller's tasks are a small fraction of
+    every task, as in production, so the planner's own choice is checked.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_tasks(3, assignees=0)
+        # Every filter below matches, so the page query is actually run
+        Task.objects.update(priority=Task.Priority.HIGH, due_date='2026-01-15')
+        # Other users own the rest of the table; ``other`` a quarter of it
+        self.other = other = User.objects.create_user('other', 'other@example.com', 'pw', role='pro')
+        busiest = User.objects.create_user('busiest', 'busiest@example.com', 'pw')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO tasks_task (title, description, priority, status, owner_id, due_date, created_at, updated_at)
+                SELECT 'Other ' || g, '', 'high', 'todo', CASE WHEN g %% 4 = 0 THEN %s ELSE %s END, '2026-01-15',
+                    now() - g * interval '1 second', now()
+                FROM generate_series(1, 20000) g
+                """,
+                [other.id, busiest.id],
+            )
+            # A few of the other user's tasks are assigned to the caller
+            cursor.execute(
+                "INSERT INTO tasks_taskassignment (task_id, user_id, assigned_at) "
+                "SELECT id, %s, now() FROM tasks_task WHERE owner_id = %s ORDER BY id LIMIT 20",
+                [self.owner.id, other.id],
+            )
+            cursor.execute('ANALYZE tasks_task, tasks_taskassignment')
+
+    def index_name(self, *fields):
+        for index in Task._meta.indexes:
+            if tuple(index.fields) == fields:
+                return index.name
+        self.fail(f"Task has no index on {fields}")
+
+    def owner_index_names(self):
+        """Every index on tasks_task led by owner_id, including the foreign key's own"""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Task._meta.db_table)
+        return [name for name, info in constraints.items() if info['index'] and info['columns'][:1] == ['owner_id']]
+
+    def explain_page_query(self, url):
+        """EXPLAIN of the query that loads the page"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        sql = [query['sql'] for query in queries if re.search(r'FROM "tasks_task" .* LIMIT \d+$', query['sql'])][-1]
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN {sql}')
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def assert_uses_index(self, url, *index_names):
+        """The page query reads tasks through one of ``index_names``, never a sequential scan"""
+        plan = self.explain_page_query(url)
+        self.assertNotRegex(plan, r'Seq Scan on tasks_task\b', plan)
+        scans = r'(Index (Only )?Scan( Backward)? using|Bitmap Index Scan on)'
+        self.assertTrue(any(re.search(rf'{scans} {name}\b', plan) for name in index_names), plan)
+        return plan
+
+    def test_scopes(self):
+        # The visible set starts from the caller's tasks: the global created_at
+        # indexes are never walked and filtered row by row
+        global_indexes = (self.index_name('-created_at', '-id'), 'tasks_task_created_at_')
+        for url in ('/api/v1/tasks/', '/api/v1/tasks/?scope=all&pagination=cursor', '/api/v1/tasks/?scope=owned'):
+            plan = self.assert_uses_index(url, *self.owner_index_names())
+            for name in global_indexes:
+                self.assertNotIn(name, plan)
+        self.assert_uses_index('/api/v1/tasks/?scope=assigned', 'tasks_task_pkey')
+
+    def test_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/v1/tasks/')
+        sql = next(query['sql'] for query in queries if query['sql'].startswith('SELECT COUNT(*)'))
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertNotRegex(plan, r'Seq Scan on tasks_task\b', plan)
+        self.assertNotIn('tasks_task_created_at_', plan)
+
+    def test_owned_filters(self):
+        owner_indexes = self.owner_index_names()
+        self.assertIn(self.index_name('owner', 'status'), owner_indexes)
+        for params in (
+            'status=todo', 'priority=high', 'due_after=2026-01-01&due_before=2026-01-31', 'ordering=-updated_at',
+        ):
+            self.assert_uses_index(f'/api/v1/tasks/?scope=owned&{params}', *owner_indexes)
+
+    def test_search(self):
+        # A caller who sees few tasks has them read by primary key; for one who sees
+        # many, the matches come from the GIN index instead of the visible set
+        Task.objects.filter(owner=self.other, id__in=Task.objects.filter(owner=self.other).values('id')[:5]).update(
+            title='Quarterly report'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE tasks_task')
+        self.client.force_authenticate(self.other)
+        self.assert_uses_index('/api/v1/tasks/?q=quarterly', self.index_name('search_vector'))
@@ -1,54 +1,530 @@
+import hashlib
+from collections import Counter
+from datetime import timedelta
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError, PermissionDenied, ValidationError
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
-from django.db import models
-from .models import Task, TaskAssignment, MediaFile
-from .serializers import TaskSerializer, MediaFileSerializer
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q, prefetch_related_objects
+from django.http import Http404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
+from notifications.fcm_utils import send_task_assignment_notification, send_task_assignment_notification_multicast
+from notifications.tasks import (
+    enqueue_on_commit, notify_task_assigned, notify_task_assigned_bulk, notify_task_unassigned,
+)
+from .models import Task, TaskAssignment, MediaFile, TaskCounter, TaskTombstone
+from .events import TASK_REMOVED_EVENT, publish_task_events, task_audience
+from .cache_utils import (
+    TASK_SUMMARY_CACHE_TTL, invalidate_task_summaries, invalidate_task_summaries_for_tasks, task_summary_cache_key,
+)
+from .filters import TaskFilter, TaskOrderingFilter, TaskSearchFilter
+from .pagination import TaskCursorPagination, UserDirectoryPagination
+from .serializers import TaskSerializer, TaskSearchResultSerializer, TaskValuesSerializer, MediaFileSerializer
 
 User = get_user_model()
 
 # Task creation limits
 BASIC_USER_TASK_LIMIT = 5
 
+# Delta sync: rows per sync page, and how far back each new round re-reads so that
+# writes still in flight when the previous round finished are not missed
+SYNC_PAGE_SIZE = 500
+SYNC_OVERLAP = timedelta(seconds=5)
+SYNC_TOKEN_SALT = 'tasks.sync'
+# Older sync tokens are rejected and the client starts over with a full sync
+SYNC_TOKEN_MAX_AGE = timedelta(days=30)
+
+# Maximum number of items accepted by the bulk endpoints
+BULK_MAX_ITEMS = 100
+
+# Seconds a page of the assignee directory is cached
+USER_DIRECTORY_CACHE_TTL = 60
+
+# Columns always loaded under ?fields=: permissions need the owner, ETags and cursors the timestamps
+TASK_REQUIRED_COLUMNS = ('id', 'owner', 'created_at', 'updated_at')
+TASK_COLUMNS = frozenset(field.name for field in Task._meta.concrete_fields)
+
+
+def task_etag(task_id, updated_at):
+    """Strong ETag for a single task; every write to the task or its nested data bumps ``updated_at``"""
+    return quote_etag(hashlib.md5(f"{task_id}:{updated_at.isoformat()}".encode()).hexdigest())
+
+
+def conditional_response(request, etag):
+    """
+    Evaluate ``If-None-Match`` / ``If-Match`` against ``etag``.
+
+    Returns a 304 or 412 response when a precondition short-circuits the request,
+    otherwise None.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        return None
+    if response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+        return Response(
+            {"detail": "Precondition failed: the task has been modified."},
+            status=status.HTTP_412_PRECONDITION_FAILED,
+        )
+    response['ETag'] = etag
+    return response
+
 
 class IsOwnerOrAssignee(permissions.BasePermission):
     def has_object_permission(self, request, view, obj: Task):
         if obj.owner_id == request.user.id:
             return True
+        # Tasks loaded through Task.objects.visible_to() already carry the assignment check
+        is_assignee = getattr(obj, 'is_assignee', None)
+        if is_assignee is not None:
+            return is_assignee
         return TaskAssignment.objects.filter(task=obj, user=request.user).exists()
 
 
 class TaskViewSet(viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAssignee]
+    filter_backends = [TaskFilter, TaskSearchFilter, TaskOrderingFilter]
+    # Actions that serialize many task instances; list renders .values() rows and
+    # detail actions load nested data only once it is needed
+    prefetch_actions = ('sync', 'bulk')
+    # Read actions that accept ?fields= / ?expand=
+    sparse_fieldset_actions = ('list', 'retrieve')
 
     def get_queryset(self):
-        user = self.request.user
-        # Owner or assigned tasks
-        assigned_ids = TaskAssignment.objects.filter(user=user).values_list('task_id', flat=True)
-        return Task.objects.filter(models.Q(owner=user) | models.Q(id__in=assigned_ids)).distinct()
+        # Owner or assigned tasks; the search vector is only needed inside the database
+        queryset = Task.objects.visible_to(self.request.user).defer('search_vector')
+        fields = self.get_requested_fields()
+        if fields is not None:
+            # Read only the selected columns, so description is skipped unless asked for
+            queryset = queryset.only(*TASK_REQUIRED_COLUMNS, *(name for name in fields if name in TASK_COLUMNS))
+        if self.action in self.prefetch_actions:
+            # Load nested serializer data in bulk so a page costs a constant number of queries
+            queryset = queryset.prefetch_related(*self.get_prefetch_lookups())
+        return queryset
+
+    def get_prefetch_lookups(self):
+        fields = self.get_requested_fields()
+        lookups = []
+        if fields is None or 'assigned_users' in fields:
+            lookups.append(Prefetch('assignments', queryset=TaskAssignment.objects.select_related('user').order_by('id')))
+        if fields is None or 'media_files' in fields:
+            lookups.append(Prefetch('media_files', queryset=MediaFile.objects.order_by('id')))
+        return lookups
+
+    def get_requested_fields(self):
+        """
+        Serializer fields selected with ``?fields=id,title,...`` plus nested fields named
+        in ``?expand=media_files,assigned_users``, or None for the full representation.
+
+        The full representation already embeds every expandable field, so ``?expand=``
+        alone only needs validating.
+        """
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+
+        fields = None
+        params = self.request.query_params if self.request is not None else {}
+        if self.action in self.sparse_fieldset_actions and ('fields' in params or 'expand' in params):
+            serializer_class = self.get_serializer_class()
+            expand = [name.strip() for name in params.get('expand', '').split(',') if name.strip()]
+            unknown = sorted(set(expand) - set(serializer_class.expandable_fields))
+            if unknown:
+                raise ValidationError({'expand': [f"Cannot expand: {', '.join(unknown)}"]})
+
+            if 'fields' in params:
+                requested = [name.strip() for name in params['fields'].split(',') if name.strip()]
+                unknown = sorted(set(requested) - set(serializer_class.Meta.fields))
+                if unknown:
+                    raise ValidationError({'fields': [f"Unknown field(s): {', '.join(unknown)}"]})
+                fields = set(requested) | set(expand)
+
+        self._requested_fields = fields
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+    @property
+    def paginator(self):
+        """
+        Switch to keyset pagination when the client opts in with ``?pagination=cursor``.
+
+        Searches and custom ``?ordering=`` are not keyed on (created_at, id), so they
+        keep page-number pagination.
+        """
+        if not hasattr(self, '_paginator') and self.request is not None and not self.is_search():
+            params = self.request.query_params
+            custom_ordering = TaskOrderingFilter.ordering_param in params
+            if not custom_ordering and (params.get('pagination') == 'cursor' or 'cursor' in params):
+                self._paginator = TaskCursorPagination()
+        return super().paginator
+
+    def is_search(self):
+        """Search results are ordered by relevance, so they are always page-number paginated"""
+        return self.action == 'list' and bool(TaskSearchFilter().get_search_terms(self.request))
+
+    def get_serializer_class(self):
+        if self.is_search():
+            return TaskSearchResultSerializer
+        return super().get_serializer_class()
+
+    def get_list_etag(self, rows):
+        """
+        ETag for a served list page, derived from the ids and ``updated_at`` of its rows.
+
+        Any write to a task or its nested data bumps ``updated_at``. Creates and deletes
+        shift the rows of the page or change its count and links, and the query string
+        covers filters, fields and the page or cursor.
+        """
+        digest = hashlib.md5()
+        # The date is included because the overdue filter moves with it
+        digest.update(f"{self.request.user.id}:{timezone.localdate().isoformat()}:{self.request.get_full_path()}".encode())
+        page = getattr(self.paginator, 'page', None)
+        if page is not None:
+            # Page-number pages carry a Django Page with the total count; cursor pages a list
+            count = getattr(getattr(page, 'paginator', None), 'count', '')
+            digest.update(f":{count}:{self.paginator.get_next_link()}:{self.paginator.get_previous_link()}".encode())
+        for row in rows:
+            digest.update(f";{row['id']}:{row['updated_at'].isoformat()}".encode())
+        return quote_etag(digest.hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        # Read-only fast path: render plain rows instead of model instances
+        serializer = TaskValuesSerializer(self.get_serializer())
+        # Besides the requested columns, rows carry the required columns (updated_at feeds
+        # the ETag) and the cursor's ordering keys; the serializer only emits requested fields
+        ordering = [name.lstrip('-') for name in getattr(self.paginator, 'ordering', ())]
+        columns = dict.fromkeys([*serializer.columns, *TASK_REQUIRED_COLUMNS, *ordering])
+        rows = self.filter_queryset(self.get_queryset()).values(*columns)
+        page = self.paginate_queryset(rows)
+
+        # Only the page is read before the precondition check; nested data is loaded after it
+        etag = self.get_list_etag(rows if page is None else page)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        if page is not None:
+            response = self.get_paginated_response(serializer.to_representation(page))
+        else:
+            response = Response(serializer.to_representation(rows))
+        response['ETag'] = etag
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = task_etag(instance.pk, instance.updated_at)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        prefetch_related_objects([instance], *self.get_prefetch_lookups())
+        response = Response(self.get_serializer(instance).data)
+        response['ETag'] = etag
+        return response
+
+    def check_write_precondition(self, request, task):
+        """
+        Honour ``If-Match`` / ``If-None-Match`` on writes for optimistic concurrency.
+
+        Must run inside the writing transaction: the row is locked and re-read so two
+        clients holding the same ETag cannot both pass and overwrite each other.
+        """
+        if 'HTTP_IF_MATCH' not in request.META and 'HTTP_IF_NONE_MATCH' not in request.META:
+            return None
+        updated_at = (
+            Task.objects.select_for_update().filter(pk=task.pk).values_list('updated_at', flat=True).first()
+        )
+        if updated_at is None:
+            raise Http404
+        return conditional_response(request, task_etag(task.pk, updated_at))
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            failed = self.check_write_precondition(request, instance)
+            if failed is not None:
+                return failed
+            self.perform_update(serializer)
+        response = Response(serializer.data)
+        response['ETag'] = task_etag(instance.pk, instance.updated_at)
+        return response
+
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
+        with transaction.atomic():
+            failed = self.check_write_precondition(request, instance)
+            if failed is not None:
+                return failed
+            self.perform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
     def perform_create(self, serializer):
         user = self.request.user
 
-        # Check task creation limit for basic users
-        if not user.is_pro() and not user.is_staff:
-            current_task_count = Task.objects.filter(owner=user).count()
-            if current_task_count >= BASIC_USER_TASK_LIMIT:
-                from rest_framework.exceptions import PermissionDenied
-                raise PermissionDenied(
-                    f"Basic users are limited to {BASIC_USER_TASK_LIMIT} tasks. "
-                    "Upgrade to Pro for unlimited tasks."
-                )
+        with transaction.atomic():
+            self.check_task_limit(user, 1)
+            task = serializer.save(owner=user)
+            TaskCounter.adjust(user.id, 1)
+            invalidate_task_summaries([user.id])
+            publish_task_events({user.id: [task.id]})
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            task = serializer.save()
+            publish_task_events(invalidate_task_summaries_for_tasks([task]))
+
+    def check_task_limit(self, user, adding):
+        """
+        Check task creation limit for basic users before ``adding`` new tasks.
+
+        Must run inside the creating transaction: the counter row lock serializes
+        concurrent creates so they cannot both pass the limit.
+        """
+        if user.is_pro() or user.is_staff:
+            return
+        current_task_count = TaskCounter.lock_for_user(user).task_count
+        if current_task_count + adding > BASIC_USER_TASK_LIMIT:
+            raise PermissionDenied(
+                f"Basic users are limited to {BASIC_USER_TASK_LIMIT} tasks. "
+                "Upgrade to Pro for unlimited tasks."
+            )
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            affected_users = TaskTombstone.record_deletion([instance])
+            instance.delete()
+            TaskCounter.adjust(instance.owner_id, -1)
+            invalidate_task_summaries(affected_users)
+            publish_task_events(affected_users, TASK_REMOVED_EVENT, reason=TaskTombstone.Reason.DELETED)
+
+    @action(detail=False, methods=['get'], url_path='sync')
+    def sync(self, request):
+        """
+        Delta sync for mobile clients.
+
+        Without ``since`` every visible task is returned. Each response carries a
+        ``token``; pass it back as ``since`` to receive only tasks created or updated
+        after it plus ``deleted`` tombstones for tasks that were deleted or unassigned.
+        While ``has_more`` is true, call again immediately with the new token. Tokens
+        older than SYNC_TOKEN_MAX_AGE are rejected; sync again without ``since``.
+        """
+        since = after = None
+        checkpoint = timezone.now() - SYNC_OVERLAP
+        token = request.query_params.get('since')
+        if token:
+            try:
+                state = signing.loads(token, salt=SYNC_TOKEN_SALT, max_age=SYNC_TOKEN_MAX_AGE)
+                since = parse_datetime(state['since']) if state['since'] else None
+                if state.get('after'):
+                    after = (parse_datetime(state['after'][0]), int(state['after'][1]))
+                    checkpoint = parse_datetime(state['checkpoint'])
+            except signing.SignatureExpired:
+                return Response({"detail": "Sync token has expired"}, status=status.HTTP_400_BAD_REQUEST)
+            except (signing.BadSignature, KeyError, IndexError, TypeError, ValueError):
+                return Response({"detail": "Invalid sync token"}, status=status.HTTP_400_BAD_REQUEST)
+
+        changed = self.get_queryset().order_by('updated_at', 'id')
+        if since:
+            changed = changed.filter(updated_at__gte=since)
+        if after:
+            changed = changed.filter(Q(updated_at__gt=after[0]) | Q(updated_at=after[0], id__gt=after[1]))
+        changed = list(changed[:SYNC_PAGE_SIZE + 1])
+        has_more = len(changed) > SYNC_PAGE_SIZE
+        changed = changed[:SYNC_PAGE_SIZE]
+
+        # Tombstones are sent once, on the first page of a round
+        deleted = {}
+        if since and not after:
+            visible_ids = Task.objects.visible_to(request.user).values('id')
+            tombstones = (
+                TaskTombstone.objects.filter(user=request.user, deleted_at__gte=since)
+                .exclude(task_id__in=visible_ids)
+                .order_by('deleted_at')
+                .values_list('task_id', 'reason')
+            )
+            deleted = dict(tombstones)
+
+        if has_more:
+            last = changed[-1]
+            state = {
+                'since': since.isoformat() if since else None,
+                'after': [last.updated_at.isoformat(), last.id],
+                'checkpoint': checkpoint.isoformat(),
+            }
+        else:
+            state = {'since': checkpoint.isoformat()}
+
+        return Response({
+            'changed': self.get_serializer(changed, many=True).data,
+            'deleted': [{'id': task_id, 'reason': reason} for task_id, reason in deleted.items()],
+            'has_more': has_more,
+            'token': signing.dumps(state, salt=SYNC_TOKEN_SALT),
+        })
 
-        serializer.save(owner=user)
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Bulk create, update or delete tasks in one transaction.
+
+        POST: a list of tasks to create.
+        PATCH: a list of partial updates, each with the task ``id``.
+        DELETE: ``{"ids": [...]}``.
+        """
+        if request.method.lower() == 'post':
+            return self._bulk_create(request)
+        if request.method.lower() == 'patch':
+            return self._bulk_update(request)
+        return self._bulk_delete(request)
+
+    def _bulk_items(self, items):
+        if not isinstance(items, list) or not items:
+            raise ParseError("Expected a non-empty list.")
+        if len(items) > BULK_MAX_ITEMS:
+            raise ParseError(f"At most {BULK_MAX_ITEMS} items can be processed per request.")
+        return items
+
+    def _bulk_ids(self, items):
+        try:
+            return [int(item) for item in items]
+        except (TypeError, ValueError):
+            raise ParseError("Task ids must be integers.")
+
+    def _bulk_create(self, request):
+        user = request.user
+        serializer = self.get_serializer(data=self._bulk_items(request.data), many=True)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            self.check_task_limit(user, len(serializer.validated_data))
+            tasks = Task.objects.bulk_create([Task(owner=user, **item) for item in serializer.validated_data])
+            TaskCounter.adjust(user.id, len(tasks))
+            invalidate_task_summaries([user.id])
+            publish_task_events({user.id: [task.id for task in tasks]})
+
+        prefetch_related_objects(tasks, 'assignments__user', 'media_files')
+        return Response(self.get_serializer(tasks, many=True).data, status=status.HTTP_201_CREATED)
+
+    def _bulk_update(self, request):
+        items = self._bulk_items(request.data)
+        if not all(isinstance(item, dict) for item in items):
+            raise ParseError("Each item must be an object with an id.")
+        ids = self._bulk_ids([item.get('id') for item in items])
+        tasks = self.get_queryset().in_bulk(ids)
+
+        now = timezone.now()
+        results = []
+        updated = {}
+        fields = set()
+        for task_id, item in zip(ids, items):
+            task = tasks.get(task_id)
+            if task is None:
+                results.append({'id': task_id, 'status': 'not_found'})
+                continue
+            serializer = self.get_serializer(task, data=item, partial=True)
+            if not serializer.is_valid():
+                results.append({'id': task_id, 'status': 'invalid', 'errors': serializer.errors})
+                continue
+            for attr, value in serializer.validated_data.items():
+                setattr(task, attr, value)
+                fields.add(attr)
+            # bulk_update() does not apply auto_now
+            task.updated_at = now
+            updated[task_id] = task
+            results.append({'id': task_id, 'status': 'updated'})
+
+        if updated:
+            with transaction.atomic():
+                Task.objects.bulk_update(updated.values(), [*fields, 'updated_at'])
+                publish_task_events(invalidate_task_summaries_for_tasks(list(updated.values())))
+
+        for result in results:
+            if result['status'] == 'updated':
+                result['task'] = self.get_serializer(updated[result['id']]).data
+        return Response(results, status=status.HTTP_200_OK)
+
+    def _bulk_delete(self, request):
+        ids = self._bulk_ids(self._bulk_items(request.data.get('ids') if isinstance(request.data, dict) else None))
+        tasks = list(Task.objects.visible_to(request.user).filter(id__in=ids).only('id', 'owner'))
+
+        with transaction.atomic():
+            affected_users = TaskTombstone.record_deletion(tasks)
+            Task.objects.filter(id__in=[task.id for task in tasks]).delete()
+            for owner_id, count in Counter(task.owner_id for task in tasks).items():
+                TaskCounter.adjust(owner_id, -count)
+            invalidate_task_summaries(affected_users)
+            publish_task_events(affected_users, TASK_REMOVED_EVENT, reason=TaskTombstone.Reason.DELETED)
+
+        deleted = {task.id for task in tasks}
+        return Response(
+            [{'id': task_id, 'status': 'deleted' if task_id in deleted else 'not_found'} for task_id in ids],
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['get'], url_path='summary')
+    def summary(self, request):
+        """Dashboard counts by status and priority plus overdue / due today totals, for owned and assigned tasks"""
+        cache_key = task_summary_cache_key(request.user.id)
+        data = cache.get(cache_key)
+        if data is None:
+            data = self._compute_summary(request.user)
+            cache.set(cache_key, data, TASK_SUMMARY_CACHE_TTL)
+        return Response(data)
+
+    def _compute_summary(self, user):
+        """Compute every summary count with one conditional-aggregation query"""
+        today = timezone.localdate()
+        unfinished = ~Q(status=Task.Status.DONE)
+        groups = {
+            'owned': Q(owner=user),
+            # is_assignee is annotated by Task.objects.visible_to()
+            'assigned': Q(is_assignee=True),
+        }
+
+        aggregates = {}
+        paths = {}
+        for group, condition in groups.items():
+            conditions = {
+                ('total',): condition,
+                ('overdue',): condition & unfinished & Q(due_date__lt=today),
+                ('due_today',): condition & unfinished & Q(due_date=today),
+            }
+            for value in Task.Status.values:
+                conditions[('by_status', value)] = condition & Q(status=value)
+            for value in Task.Priority.values:
+                conditions[('by_priority', value)] = condition & Q(priority=value)
+            for path, filter_condition in conditions.items():
+                alias = '_'.join((group, *path))
+                aggregates[alias] = Count('id', filter=filter_condition)
+                paths[alias] = (group, *path)
+
+        totals = Task.objects.visible_to(user).aggregate(**aggregates)
+
+        data = {}
+        for alias, path in paths.items():
+            node = data
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = totals[alias]
+        return data
 
     @action(detail=False, methods=['get'], url_path='count')
     def task_count(self, request):
         """Get current user's task count and limit"""
         user = request.user
-        current_count = Task.objects.filter(owner=user).count()
+        current_count = TaskCounter.get_count(user)
 
         if user.is_pro() or user.is_staff:
             limit = None  # Unlimited
@@ -77,28 +553,67 @@ class TaskViewSet(viewsets.ModelViewSet):
         except User.DoesNotExist:
             return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        assignment, created = TaskAssignment.objects.get_or_create(task=task, user=assignee)
+        with transaction.atomic():
+            assignment, created = TaskAssignment.objects.get_or_create(task=task, user=assignee)
 
-        # Send push notification to assignee
-        if created:
-            try:
-                from notifications.fcm_utils import send_task_assignment_notification
+            # The push goes to the outbox with the assignment; the in-app notification
+            # is created by a background job after commit
+            if created:
+                task.touch()
                 send_task_assignment_notification(task, assignee)
-            except Exception as e:
-                # Don't fail the request if notification fails
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"Failed to send task assignment notification: {str(e)}")
-
-            # Create in-app notification
-            from notifications.models import Notification
-            Notification.objects.create(
-                user=assignee,
-                message=f"You've been assigned to task: {task.title}"
-            )
+                enqueue_on_commit(notify_task_assigned, task.id, assignee.id)
+                invalidate_task_summaries([assignee.id])
+                publish_task_events(task_audience([task]))
 
         return Response({"message": "Task assigned"}, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=['post'], url_path='assign-bulk')
+    def assign_bulk(self, request, pk=None):
+        """Assign several users to a task in one call (Pro only)"""
+        task = self.get_object()
+        if not request.user.is_pro():
+            return Response({"detail": "Only Pro users can assign tasks."}, status=status.HTTP_403_FORBIDDEN)
+        user_ids = self._bulk_ids(
+            self._bulk_items(request.data.get('user_ids') if isinstance(request.data, dict) else None)
+        )
+
+        found = set(User.objects.filter(pk__in=user_ids).values_list('id', flat=True))
+        already_assigned = set(
+            TaskAssignment.objects.filter(task=task, user_id__in=found).values_list('user_id', flat=True)
+        )
+        new_ids = list(dict.fromkeys(user_id for user_id in user_ids if user_id in found - already_assigned))
+
+        if new_ids:
+            with transaction.atomic():
+                # ignore_conflicts relies on unique_together to skip rows assigned concurrently
+                assignments = TaskAssignment.objects.bulk_create(
+                    [TaskAssignment(task=task, user_id=user_id) for user_id in new_ids],
+                    ignore_conflicts=True,
+                )
+                # Skipped rows are not reported, so keep only the users whose row carries our timestamp
+                stamps = {(assignment.user_id, assignment.assigned_at) for assignment in assignments}
+                inserted = {
+                    user_id for user_id, assigned_at in TaskAssignment.objects.filter(
+                        task=task, user_id__in=new_ids
+                    ).values_list('user_id', 'assigned_at')
+                    if (user_id, assigned_at) in stamps
+                }
+                already_assigned.update(user_id for user_id in new_ids if user_id not in inserted)
+                new_ids = [user_id for user_id in new_ids if user_id in inserted]
+                if new_ids:
+                    task.touch()
+                    send_task_assignment_notification_multicast(task, new_ids)
+                    enqueue_on_commit(notify_task_assigned_bulk, task.id, new_ids)
+                    invalidate_task_summaries(new_ids)
+                    publish_task_events(task_audience([task]))
+
+        return Response({
+            "message": "Task assigned",
+            "assigned": new_ids,
+            "already_assigned": sorted(already_assigned),
+            "not_found": sorted(set(user_ids) - found),
+        }, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=['post', 'get', 'delete'], url_path='media')
     def media(self, request, pk=None):
         task = self.get_object()
@@ -131,6 +646,8 @@ class TaskViewSet(viewsets.ModelViewSet):
                         logger.warning(f"Could not delete from Cloudinary: {e}")
 
                 media.delete()
+                task.touch()
+                publish_task_events(task_audience([task]))
                 return Response({"message": "Media file deleted successfully"}, status=status.HTTP_200_OK)
             except MediaFile.DoesNotExist:
                 return Response({"detail": "Media file not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -157,6 +674,8 @@ class TaskViewSet(viewsets.ModelViewSet):
                 file_url=result['url'],
                 file_type=file_type
             )
+            task.touch()
+            publish_task_events(task_audience([task]))
             return Response(MediaFileSerializer(media).data, status=status.HTTP_201_CREATED)
 
         # Fallback: Accept pre-uploaded Cloudinary URL (for Flutter direct upload)
@@ -170,6 +689,8 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
 
         media = MediaFile.objects.create(task=task, file_url=file_url, file_type=file_type)
+        task.touch()
+        publish_task_events(task_audience([task]))
         return Response(MediaFileSerializer(media).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['delete'], url_path='unassign')
@@ -185,15 +706,18 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         try:
             assignment = TaskAssignment.objects.get(task=task, user_id=user_id)
-            assignment.delete()
-
-            # Create in-app notification
-            from notifications.models import Notification
-            assignee = User.objects.get(pk=user_id)
-            Notification.objects.create(
-                user=assignee,
-                message=f"You've been unassigned from task: {task.title}"
-            )
+            with transaction.atomic():
+                assignment.delete()
+                TaskTombstone.objects.create(
+                    task_id=task.id, user_id=assignment.user_id, reason=TaskTombstone.Reason.UNASSIGNED
+                )
+                task.touch()
+                enqueue_on_commit(notify_task_unassigned, task.id, assignment.user_id)
+                invalidate_task_summaries([assignment.user_id])
+                publish_task_events(
+                    {assignment.user_id: [task.id]}, TASK_REMOVED_EVENT, reason=TaskTombstone.Reason.UNASSIGNED
+                )
+                publish_task_events(task_audience([task]))
 
             return Response({"message": "Task unassigned"}, status=status.HTTP_200_OK)
         except TaskAssignment.DoesNotExist:
@@ -201,14 +725,31 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='users')
     def get_users(self, request):
-        """Get list of users for task assignment (Pro only)"""
+        """
+        Paginated directory of users for task assignment (Pro only)
+
+        ``?search=`` matches a case-insensitive prefix of the username or email.
+        Pages are cached briefly since the picker re-requests them while typing.
+        """
         if not request.user.is_pro():
             return Response({"detail": "Only Pro users can access user list."}, status=status.HTTP_403_FORBIDDEN)
 
-        # Return list of active verified users (excluding current user)
-        users = User.objects.filter(
-            is_active=True,
-            is_verified=True
-        ).exclude(id=request.user.id).values('id', 'username', 'email', 'role')
-
-        return Response(list(users), status=status.HTTP_200_OK)
+        query = hashlib.md5(request.query_params.urlencode().encode()).hexdigest()
+        cache_key = f"tasks:user_directory:{request.user.id}:{query}"
+        data = cache.get(cache_key)
+        if data is None:
+            # Active verified users (excluding current user)
+            users = User.objects.filter(
+                is_active=True,
+                is_verified=True
+            ).exclude(id=request.user.id)
+            search = request.query_params.get('search', '').strip()
+            if search:
+                users = users.filter(Q(username__istartswith=search) | Q(email__istartswith=search))
+
+            paginator = UserDirectoryPagination()
+            page = paginator.paginate_queryset(users.values('id', 'username', 'email', 'role'), request, view=self)
+            data = paginator.get_paginated_response(page).data
+            cache.set(cache_key, data, USER_DIRECTORY_CACHE_TTL)
+
+        return Response(data, status=status.HTTP_200_OK)